@@ -5,186 +5,324 @@ Usage: python run_evaluation.py [system_type]
 """
 import sys
 import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import List
 
-from src.config.settings import settings
+from src.config.settings import get_settings
 from src.data.loader import DatasetLoader
-from src.evaluators.base import GeminiModel
-from src.evaluators.rag_evaluator import RAGEvaluator
-from src.evaluators.agent_evaluator import AgentEvaluator
-from src.evaluators.chatbot_evaluator import ChatbotEvaluator
 from src.utils.report import ReportGenerator
+from src.utils.cache import JudgeCache
+from src.utils.rate_limiter import AsyncTokenBucket
+
+# Evaluator modules pull in deepeval and google-genai, so they are imported
+# inside the run_* functions that need them. This keeps --help and
+# configuration errors fast.
+settings = get_settings()
+log = logging.getLogger("eval")
+
+# Shared by every model so concurrent evaluations stay within one quota
+rate_limiter = (
+    AsyncTokenBucket(rpm=settings.gemini_rpm or None, tpm=settings.gemini_tpm or None)
+    if settings.gemini_rpm or settings.gemini_tpm
+    else None
+)
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that holds formatted records until flush_log() writes them in one go."""
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._pending = []
+
+    def emit(self, record):
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._pending:
+                self.stream.write("".join(self._pending))
+                self._pending.clear()
+            super().flush()
+        finally:
+            self.release()
+
+
+def configure_logging():
+    """Send eval log records to stdout, buffered in the handler and flushed at section ends."""
+    if log.handlers:
+        return
+    handler = BufferedStreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+def flush_log():
+    """Flush buffered log output (called at section boundaries)."""
+    for handler in log.handlers:
+        handler.flush()
+
+
+def create_model():
+    """Create the Gemini judge model from settings."""
+    from src.evaluators.base import GeminiModel
+
+    return GeminiModel(
+        model=settings.gemini_model,
+        api_key=settings.gemini_api_key,
+        rate_limiter=rate_limiter,
+    )
+
+
+def create_cache():
+    """Create the judge response cache from settings, or None when disabled."""
+    if not settings.judge_cache:
+        return None
+    return JudgeCache(
+        settings.report_dir / ".judge_cache",
+        ttl=settings.judge_cache_ttl or None,
+        max_size=settings.judge_cache_max_size or None,
+    )
+
+
+def results_path(system_type):
+    """Return the JSONL file to stream individual results to, or None when disabled."""
+    if not settings.stream_results:
+        return None
+    return settings.report_dir / f"{system_type}_results.jsonl"
+
+
+def save_reports(report_gen, results, system_type):
+    """Save the enabled JSON/HTML reports."""
+    if settings.save_json and settings.save_html:
+        # One call so both files share the same timestamp
+        json_path, html_path = report_gen.save_all(results, system_type)
+        log.info(f"\n💾 JSON report saved: {json_path}")
+        log.info(f"💾 HTML report saved: {html_path}")
+        return
+    if settings.save_json:
+        log.info(f"\n💾 JSON report saved: {report_gen.save_json_report(results, system_type)}")
+    if settings.save_html:
+        log.info(f"💾 HTML report saved: {report_gen.save_html_report(results, system_type)}")
 
 
 def run_rag_evaluation():
     """Run RAG system evaluation."""
-    print("=" * 60)
-    print("Running RAG System Evaluation")
-    print("=" * 60)
+    from src.evaluators.rag_evaluator import RAGEvaluator
+
+    log.info("=" * 60)
+    log.info("Running RAG System Evaluation")
+    log.info("=" * 60)
 
     # Initialize components
-    model = GeminiModel(
-        model=settings.gemini_model,
-        api_key=settings.gemini_api_key,
-    )
+    model = create_model()
     loader = DatasetLoader(settings.datasets_dir)
-    evaluator = RAGEvaluator(model=model, threshold=settings.default_threshold)
+    evaluator = RAGEvaluator(
+        model=model,
+        threshold=settings.default_threshold,
+        max_concurrent=settings.max_concurrent,
+        cache=create_cache(),
+        combined=settings.judge_combined,
+    )
     report_gen = ReportGenerator(settings.report_dir)
 
     # Load test cases
-    print("\n📂 Loading RAG dataset...")
+    log.info("\n📂 Loading RAG dataset...")
     test_cases = loader.load_rag_dataset()
-    print(f"✓ Loaded {len(test_cases)} test cases")
+    log.info(f"✓ Loaded {len(test_cases)} test cases")
 
     # Run evaluation
-    print("\n🔍 Running evaluation...")
-    results = evaluator.evaluate(test_cases)
+    log.info("\n🔍 Running evaluation...")
+    flush_log()
+    results = evaluator.evaluate(test_cases, results_path("rag"))
 
     # Generate and print report
-    print("\n" + evaluator.generate_report(results))
+    log.info("\n" + evaluator.generate_report(results))
 
     # Save reports
-    if settings.save_json:
-        json_path = report_gen.save_json_report(results, "rag")
-        print(f"\n💾 JSON report saved: {json_path}")
-
-    if settings.save_html:
-        html_path = report_gen.save_html_report(results, "rag")
-        print(f"💾 HTML report saved: {html_path}")
+    save_reports(report_gen, results, "rag")
 
     return 0 if results["passed"] else 1
 
 
 def run_agent_evaluation():
     """Run Agent system evaluation."""
-    print("=" * 60)
-    print("Running Agent System Evaluation")
-    print("=" * 60)
+    from src.evaluators.agent_evaluator import AgentEvaluator
+
+    log.info("=" * 60)
+    log.info("Running Agent System Evaluation")
+    log.info("=" * 60)
 
     # Initialize components
-    model = GeminiModel(
-        model=settings.gemini_model,
-        api_key=settings.gemini_api_key,
-    )
+    model = create_model()
     loader = DatasetLoader(settings.datasets_dir)
-    evaluator = AgentEvaluator(model=model, threshold=settings.default_threshold)
+    evaluator = AgentEvaluator(
+        model=model,
+        threshold=settings.default_threshold,
+        max_concurrent=settings.max_concurrent,
+        batch_size=settings.judge_batch_size or None,
+        cache=create_cache(),
+    )
     report_gen = ReportGenerator(settings.report_dir)
 
     # Load test cases
-    print("\n📂 Loading Agent dataset...")
+    log.info("\n📂 Loading Agent dataset...")
     test_cases = loader.load_agent_dataset()
-    print(f"✓ Loaded {len(test_cases)} test cases")
+    log.info(f"✓ Loaded {len(test_cases)} test cases")
 
     # Run evaluation
-    print("\n🔍 Running evaluation...")
-    results = evaluator.evaluate(test_cases)
+    log.info("\n🔍 Running evaluation...")
+    flush_log()
+    results = evaluator.evaluate(test_cases, results_path("agent"))
 
     # Generate and print report
-    print("\n" + evaluator.generate_report(results))
+    log.info("\n" + evaluator.generate_report(results))
 
     # Save reports
-    if settings.save_json:
-        json_path = report_gen.save_json_report(results, "agent")
-        print(f"\n💾 JSON report saved: {json_path}")
-
-    if settings.save_html:
-        html_path = report_gen.save_html_report(results, "agent")
-        print(f"💾 HTML report saved: {html_path}")
+    save_reports(report_gen, results, "agent")
 
     return 0 if results["passed"] else 1
 
 
 def run_chatbot_evaluation():
     """Run Chatbot system evaluation."""
-    print("=" * 60)
-    print("Running Chatbot System Evaluation")
-    print("=" * 60)
+    from src.evaluators.chatbot_evaluator import ChatbotEvaluator
+
+    log.info("=" * 60)
+    log.info("Running Chatbot System Evaluation")
+    log.info("=" * 60)
 
     # Initialize components
-    model = GeminiModel(
-        model=settings.gemini_model,
-        api_key=settings.gemini_api_key,
-    )
+    model = create_model()
     loader = DatasetLoader(settings.datasets_dir)
     evaluator = ChatbotEvaluator(
         model=model,
         threshold=settings.default_threshold,
         toxicity_threshold=settings.toxicity_threshold,
+        max_concurrent=settings.max_concurrent,
+        cache=create_cache(),
+        fail_fast=settings.chatbot_fail_fast,
     )
     report_gen = ReportGenerator(settings.report_dir)
 
     # Load test cases
-    print("\n📂 Loading Chatbot dataset...")
+    log.info("\n📂 Loading Chatbot dataset...")
     test_cases = loader.load_chatbot_dataset()
-    print(f"✓ Loaded {len(test_cases)} test cases")
+    log.info(f"✓ Loaded {len(test_cases)} test cases")
 
     # Run evaluation
-    print("\n🔍 Running evaluation...")
-    results = evaluator.evaluate(test_cases)
+    log.info("\n🔍 Running evaluation...")
+    flush_log()
+    results = evaluator.evaluate(test_cases, results_path("chatbot"))
 
     # Generate and print report
-    print("\n" + evaluator.generate_report(results))
+    log.info("\n" + evaluator.generate_report(results))
 
     # Save reports
-    if settings.save_json:
-        json_path = report_gen.save_json_report(results, "chatbot")
-        print(f"\n💾 JSON report saved: {json_path}")
-
-    if settings.save_html:
-        html_path = report_gen.save_html_report(results, "chatbot")
-        print(f"💾 HTML report saved: {html_path}")
+    save_reports(report_gen, results, "chatbot")
 
     # Critical failure check for toxic content
     if results.get("critical_failure", False):
-        print("\n🚨 CRITICAL FAILURE: Toxic content detected!")
-        print("Exiting with error code 1")
+        log.info("\n🚨 CRITICAL FAILURE: Toxic content detected!")
+        log.info("Exiting with error code 1")
         return 1
 
     return 0 if results["passed"] else 1
 
 
-def run_all_evaluations():
-    """Run all system evaluations."""
-    print("\n" + "=" * 60)
-    print("Running ALL System Evaluations")
-    print("=" * 60)
+class ThreadBufferingHandler(logging.Handler):
+    """Handler that collects each worker thread's log records and emits them in one go."""
 
-    exit_codes = []
+    def __init__(self, targets: List[logging.Handler]):
+        super().__init__()
+        self.targets = targets
+        self._local = threading.local()
 
-    # Run RAG
-    try:
-        exit_codes.append(run_rag_evaluation())
-    except Exception as e:
-        print(f"\n❌ RAG evaluation failed: {e}")
-        exit_codes.append(1)
+    def start_capture(self) -> None:
+        """Start collecting log records for the current thread."""
+        self._local.records = []
+
+    def stop_capture(self) -> List[logging.LogRecord]:
+        """Stop buffering for the current thread and return the collected records."""
+        records, self._local.records = self._local.records, None
+        return records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        records = getattr(self._local, "records", None)
+        if records is not None:
+            records.append(record)
+        else:
+            self.replay([record])
 
-    print("\n" + "-" * 60 + "\n")
+    def replay(self, records: List[logging.LogRecord]) -> None:
+        """Emit the records through the original handlers."""
+        for record in records:
+            for target in self.targets:
+                target.handle(record)
 
-    # Run Agent
+
+def _run_captured(name, run, handler: ThreadBufferingHandler):
+    """Run one evaluation and return (exit code, captured log records)."""
+    handler.start_capture()
     try:
-        exit_codes.append(run_agent_evaluation())
+        exit_code = run()
     except Exception as e:
-        print(f"\n❌ Agent evaluation failed: {e}")
-        exit_codes.append(1)
+        log.info(f"\n❌ {name} evaluation failed: {e}")
+        exit_code = 1
+    finally:
+        records = handler.stop_capture()
+    return exit_code, records
 
-    print("\n" + "-" * 60 + "\n")
 
-    # Run Chatbot
+def run_all_evaluations():
+    """Run all system evaluations concurrently."""
+    log.info("\n" + "=" * 60)
+    log.info("Running ALL System Evaluations")
+    log.info("=" * 60)
+
+    runs = {
+        "RAG": run_rag_evaluation,
+        "Agent": run_agent_evaluation,
+        "Chatbot": run_chatbot_evaluation,
+    }
+    exit_codes = {}
+
+    # The evaluations share no state, so run them concurrently; each one's
+    # output is printed in one block when it finishes so sections never interleave
+    handlers = log.handlers
+    capture = ThreadBufferingHandler(handlers)
+    log.handlers = [capture]
     try:
-        exit_codes.append(run_chatbot_evaluation())
-    except Exception as e:
-        print(f"\n❌ Chatbot evaluation failed: {e}")
-        exit_codes.append(1)
+        with ThreadPoolExecutor(max_workers=len(runs)) as executor:
+            futures = {
+                executor.submit(_run_captured, name, run, capture): name
+                for name, run in runs.items()
+            }
+            for future in as_completed(futures):
+                exit_codes[futures[future]], records = future.result()
+                capture.replay(records)
+                log.info("-" * 60 + "\n")
+                flush_log()
+    finally:
+        log.handlers = handlers
 
     # Summary
-    print("\n" + "=" * 60)
-    print("EVALUATION SUMMARY")
-    print("=" * 60)
-    print(f"RAG: {'✅ PASSED' if exit_codes[0] == 0 else '❌ FAILED'}")
-    print(f"Agent: {'✅ PASSED' if exit_codes[1] == 0 else '❌ FAILED'}")
-    print(f"Chatbot: {'✅ PASSED' if exit_codes[2] == 0 else '❌ FAILED'}")
+    log.info("\n" + "=" * 60)
+    log.info("EVALUATION SUMMARY")
+    log.info("=" * 60)
+    for name in runs:
+        log.info(f"{name}: {'✅ PASSED' if exit_codes[name] == 0 else '❌ FAILED'}")
 
-    return max(exit_codes)
+    return max(exit_codes.values())
 
 
 def main():
@@ -214,25 +352,26 @@ Examples:
     )
 
     args = parser.parse_args()
+    configure_logging()
 
-    # Validate API key
     try:
-        settings.validate_api_key()
-    except ValueError as e:
-        print(f"❌ Configuration Error: {e}")
-        print("\nPlease set GEMINI_API_KEY in your .env file")
-        return 1
+        # Validate API key
+        try:
+            settings.validate_api_key()
+        except ValueError as e:
+            log.info(f"❌ Configuration Error: {e}")
+            log.info("\nPlease set GEMINI_API_KEY in your .env file")
+            return 1
 
-    # Ensure directories exist
-    settings.ensure_directories()
+        # Ensure directories exist
+        settings.ensure_directories()
 
-    # Override threshold if provided
-    if args.threshold:
-        settings.default_threshold = args.threshold
-        print(f"Using custom threshold: {args.threshold}")
+        # Override threshold if provided
+        if args.threshold:
+            settings.default_threshold = args.threshold
+            log.info(f"Using custom threshold: {args.threshold}")
 
-    # Run evaluation based on system type
-    try:
+        # Run evaluation based on system type
         if args.system == "rag":
             exit_code = run_rag_evaluation()
         elif args.system == "agent":
@@ -242,19 +381,22 @@ Examples:
         elif args.system == "all":
             exit_code = run_all_evaluations()
         else:
-            print(f"Unknown system type: {args.system}")
+            log.info(f"Unknown system type: {args.system}")
             return 1
 
         return exit_code
 
     except KeyboardInterrupt:
-        print("\n\n⚠️  Evaluation interrupted by user")
+        log.info("\n\n⚠️  Evaluation interrupted by user")
         return 130
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
+        log.info(f"\n❌ Unexpected error: {e}")
+        flush_log()
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        flush_log()
 
 
 if __name__ == "__main__":
@@ -2,41 +2,57 @@
 LLM 평가 프레임워크를 위한 설정
 환경 변수를 로드하고 애플리케이션 전역 설정을 제공합니다.
 """
-import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import Any
+from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-# .env 파일에서 환경 변수 로드
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """환경 변수에서 로드된 애플리케이션 설정"""
 
     # Gemini API 설정
-    gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
-    gemini_model: str = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+    gemini_api_key: str = ""
+    gemini_model: str = "gemini-2.0-flash-exp"
 
     # 평가 임계값
-    default_threshold: float = float(os.getenv("DEFAULT_THRESHOLD", "0.7"))
-    toxicity_threshold: float = float(os.getenv("TOXICITY_THRESHOLD", "0.0"))
+    default_threshold: float = 0.7
+    toxicity_threshold: float = 0.0
+    # True이면 첫 toxic 케이스에서 Chatbot 평가를 조기 종료
+    chatbot_fail_fast: bool = False
+
+    # 동시성 설정
+    max_concurrent: int = 10
+    # 0이면 케이스마다 개별 요청으로 채점
+    judge_batch_size: int = 0
+    # True이면 RAG 메트릭 세 개를 케이스마다 한 번의 요청으로 함께 채점
+    judge_combined: bool = False
+
+    # Gemini 할당량 (0이면 제한 없음)
+    gemini_rpm: int = 0
+    gemini_tpm: int = 0
+
+    # judge 응답 캐시 설정 (보고서 디렉토리의 .judge_cache에 저장)
+    judge_cache: bool = False
+    # 0이면 만료 없음 (초 단위)
+    judge_cache_ttl: float = 0
+    # 0이면 크기 제한 없음 (초과 시 LRU 삭제)
+    judge_cache_max_size: int = 0
+    # 테스트 스위트의 evaluate() 결과를 보고서 디렉토리의 .eval_cache에 저장해 재사용 (CI에서는 끔)
+    eval_cache: bool = False
 
     # 보고서 설정
-    report_dir: Path = Path(os.getenv("REPORT_DIR", "./reports"))
-    save_json: bool = os.getenv("SAVE_JSON", "true").lower() == "true"
-    save_html: bool = os.getenv("SAVE_HTML", "true").lower() == "true"
+    report_dir: Path = Path("./reports")
+    # 개별 결과를 보고서 디렉토리의 <시스템>_results.jsonl에 스트리밍 (재실행 시 이어서 평가)
+    stream_results: bool = False
+    save_json: bool = True
+    save_html: bool = True
 
     # 프로젝트 경로
     project_root: Path = Path(__file__).parent.parent.parent
     datasets_dir: Path = project_root / "datasets"
 
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8"
-    )
-
     def validate_api_key(self) -> None:
         """Gemini API 키가 설정되었는지 검증합니다."""
         if not self.gemini_api_key or self.gemini_api_key == "your_api_key_here":
@@ -51,5 +67,38 @@ class Settings(BaseSettings):
         self.datasets_dir.mkdir(parents=True, exist_ok=True)
 
 
-# 전역 설정 인스턴스
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    애플리케이션 설정을 반환합니다.
+
+    .env 파일 로드와 설정 생성은 처음 호출될 때 한 번만 수행되고,
+    이후 호출에서는 같은 인스턴스를 재사용합니다.
+
+    Returns:
+        전역 설정 인스턴스
+    """
+    # .env 파일에서 환경 변수 로드 (Settings는 환경 변수에서 값을 읽음)
+    load_dotenv()
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    전역 설정 인스턴스(settings)를 처음 접근할 때 생성합니다.
+
+    모듈을 import하는 것만으로는 .env를 로드하지 않고,
+    `from src.config.settings import settings`처럼 실제로 접근할 때 get_settings()를 호출합니다.
+
+    Args:
+        name: 접근한 모듈 속성 이름
+
+    Returns:
+        name이 "settings"이면 전역 설정 인스턴스
+
+    Raises:
+        AttributeError: 정의되지 않은 속성에 접근한 경우
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,9 +3,19 @@ JSON 파일에서 테스트 데이터셋을 로드하는 데이터 로더
 """
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Generic, Type, TypeVar
 from pydantic import BaseModel, Field
 
+try:
+    import ijson
+except ImportError:  # 선택 의존성 (speedups)
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (speedups)
+    orjson = None
+
 
 class RAGTestCase(BaseModel):
     """RAG 시스템 평가를 위한 테스트 케이스 모델"""
@@ -28,6 +38,14 @@ class ChatbotTestCase(BaseModel):
     actual_output: str = Field(..., description="Chatbot 응답")
 
 
+TestCaseT = TypeVar("TestCaseT", bound=BaseModel)
+
+
+class TestCaseDataset(BaseModel, Generic[TestCaseT]):
+    """테스트 케이스 목록을 담는 데이터셋 파일 모델"""
+    test_cases: List[TestCaseT] = Field(default_factory=list, description="테스트 케이스 목록")
+
+
 class DatasetLoader:
     """JSON 파일로부터 테스트 데이터셋을 로드하는 로더"""
 
@@ -54,13 +72,54 @@ class DatasetLoader:
             FileNotFoundError: 파일이 존재하지 않을 경우
             json.JSONDecodeError: 파일이 유효한 JSON이 아닐 경우
         """
+        file_path = self._resolve_path(filename)
+
+        if orjson is not None:
+            # orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스입니다
+            return orjson.loads(file_path.read_bytes())
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_test_cases(self, filename: str, case_type: Type[TestCaseT]) -> List[TestCaseT]:
+        """
+        JSON 파일의 test_cases 항목을 지정한 모델 리스트로 로드합니다.
+
+        ijson이 설치되어 있으면 파일을 스트리밍으로 읽어 케이스를 하나씩 검증하므로
+        전체 JSON을 메모리에 올리지 않습니다. 없으면 Pydantic이 파일 전체에 대해
+        JSON 파싱과 검증을 한 번에 수행합니다.
+
+        Args:
+            filename: JSON 파일 이름
+            case_type: 테스트 케이스 모델 클래스
+
+        Returns:
+            테스트 케이스 객체 리스트
+
+        Raises:
+            FileNotFoundError: 파일이 존재하지 않을 경우
+            pydantic.ValidationError: JSON 형식이나 필드가 유효하지 않을 경우
+        """
+        file_path = self._resolve_path(filename)
+
+        if ijson is not None:
+            with open(file_path, 'rb') as f:
+                return [
+                    case_type.model_validate(case)
+                    for case in ijson.items(f, "test_cases.item", use_float=True)
+                ]
+
+        dataset = TestCaseDataset[case_type].model_validate_json(file_path.read_bytes())
+        return dataset.test_cases
+
+    def _resolve_path(self, filename: str) -> Path:
+        """데이터셋 파일 경로를 반환하고 존재 여부를 확인합니다."""
         file_path = self.datasets_dir / filename
 
         if not file_path.exists():
             raise FileNotFoundError(f"Dataset file not found: {file_path}")
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return file_path
 
     def load_rag_dataset(self, filename: str = "rag_dataset.json") -> List[RAGTestCase]:
         """
@@ -72,9 +131,7 @@ class DatasetLoader:
         Returns:
             RAGTestCase 객체 리스트
         """
-        data = self.load_json(filename)
-        test_cases = data.get("test_cases", [])
-        return [RAGTestCase(**case) for case in test_cases]
+        return self.load_test_cases(filename, RAGTestCase)
 
     def load_agent_dataset(self, filename: str = "agent_dataset.json") -> List[AgentTestCase]:
         """
@@ -86,9 +143,7 @@ class DatasetLoader:
         Returns:
             AgentTestCase 객체 리스트
         """
-        data = self.load_json(filename)
-        test_cases = data.get("test_cases", [])
-        return [AgentTestCase(**case) for case in test_cases]
+        return self.load_test_cases(filename, AgentTestCase)
 
     def load_chatbot_dataset(self, filename: str = "chatbot_dataset.json") -> List[ChatbotTestCase]:
         """
@@ -100,9 +155,7 @@ class DatasetLoader:
         Returns:
             ChatbotTestCase 객체 리스트
         """
-        data = self.load_json(filename)
-        test_cases = data.get("test_cases", [])
-        return [ChatbotTestCase(**case) for case in test_cases]
+        return self.load_test_cases(filename, ChatbotTestCase)
 
     def validate_dataset(self, test_cases: List[BaseModel]) -> bool:
         """
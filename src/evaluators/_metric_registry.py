@@ -0,0 +1,35 @@
+"""
+평가자 간에 공유하는 DeepEval 메트릭 인스턴스 레지스트리
+같은 (메트릭 클래스, 임계값, 모델) 조합은 하나의 인스턴스만 생성합니다.
+레지스트리 크기는 제한되어 있어, 오래 쓰이지 않은 조합의 메트릭과 모델은 밀려나 해제됩니다.
+"""
+from functools import lru_cache
+from typing import Type, TypeVar
+from deepeval.metrics import BaseMetric
+from deepeval.models import DeepEvalBaseLLM
+
+MetricT = TypeVar("MetricT", bound=BaseMetric)
+
+# 한 번의 실행에서 쓰는 조합(메트릭 종류 x 임계값 x 모델)보다 넉넉한 크기
+_REGISTRY_SIZE = 32
+
+
+@lru_cache(maxsize=_REGISTRY_SIZE)
+def get_metric(cls: Type[MetricT], threshold: float, model: DeepEvalBaseLLM) -> MetricT:
+    """
+    메트릭 클래스, 임계값, 모델 조합에 해당하는 공유 메트릭 인스턴스를 반환합니다.
+
+    공유 인스턴스는 측정 템플릿으로만 사용해야 합니다. 측정 결과가 인스턴스의
+    score/reason에 기록되므로 측정은 BaseEvaluator.a_measure_metric처럼
+    케이스마다 복사본으로 수행합니다.
+    레지스트리를 비우려면 get_metric.cache_clear()를 호출합니다.
+
+    Args:
+        cls: 생성할 DeepEval 메트릭 클래스
+        threshold: 메트릭 통과 임계값
+        model: DeepEval 모델 인스턴스 (인스턴스 단위로 구분)
+
+    Returns:
+        공유 메트릭 인스턴스
+    """
+    return cls(threshold=threshold, model=model)
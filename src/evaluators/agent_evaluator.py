@@ -2,22 +2,59 @@
 Agent 시스템 평가자
 Correctness와 Answer Relevancy 메트릭을 사용하여 Agent 시스템을 평가합니다.
 """
-from typing import List, Dict, Any
+import asyncio
+from pathlib import Path
+from typing import List, Dict, Any, Awaitable, Optional, Tuple
 from deepeval.metrics import (
     GEval,
     AnswerRelevancyMetric,
 )
 from deepeval.test_case import LLMTestCase, LLMTestCaseParams
-from .base import BaseEvaluator, DeepEvalBaseLLM
+from ._metric_registry import get_metric
+from .base import BaseEvaluator, DeepEvalBaseLLM, MetricResult
+from .batch_metrics import BatchGEval
+from ..utils.cache import JudgeCache
+from ..utils.results_stream import ResultsStream
 
+CORRECTNESS_CRITERIA = "실제 출력이 예상 출력과 비교하여 정확한지 판단합니다."
+
+# G-Eval이 케이스마다 LLM으로 평가 단계를 생성하지 않도록 미리 정해 둔 평가 단계
+CORRECTNESS_STEPS = [
+    "입력의 요청을 확인하고 예상 출력이 담고 있는 핵심 사실과 결과를 파악합니다.",
+    "실제 출력이 예상 출력의 핵심 사실과 결과를 빠짐없이 담고 있는지 확인합니다.",
+    "실제 출력에 예상 출력과 모순되거나 사실과 다른 내용이 있으면 감점합니다.",
+    "표현 방식이나 어순의 차이는 의미가 같다면 감점하지 않습니다.",
+]
+
+# 사람이 읽을 수 있는 보고서 템플릿
+_SEP = "=" * 60
+_HEADER = f"{_SEP}\nAGENT SYSTEM EVALUATION REPORT\n{_SEP}"
+
+_REPORT_TEMPLATE = _HEADER + """
+
+Total Test Cases: {total_cases}
+
+Average Scores:
+  - Correctness: {average_correctness:.3f}
+  - Answer Relevancy: {average_answer_relevancy:.3f}
+
+Overall Average: {overall_average:.3f}
+Status: {status}
+
+""" + _SEP
 
 class AgentEvaluator(BaseEvaluator):
     """Agent 시스템 평가자"""
 
+    __slots__ = ("batch_size", "correctness_metric", "answer_relevancy_metric")
+
     def __init__(
         self,
         model: DeepEvalBaseLLM,
         threshold: float = 0.7,
+        max_concurrent: int = 10,
+        batch_size: Optional[int] = None,
+        cache: Optional[JudgeCache] = None,
     ):
         """
         Agent 평가자를 초기화합니다.
@@ -25,64 +62,120 @@ class AgentEvaluator(BaseEvaluator):
         Args:
             model: DeepEval 모델 인스턴스
             threshold: 통과 최소 점수 임계값
+            max_concurrent: 동시에 평가할 최대 테스트 케이스 수
+            batch_size: 지정하면 Correctness를 이 개수만큼 묶어 한 번의 요청으로 채점
+            cache: judge 응답 캐시 (None이면 캐시 사용 안 함)
         """
-        super().__init__(model, threshold)
-
-        # G-Eval을 사용하여 Correctness 메트릭 초기화
-        self.correctness_metric = GEval(
-            name="Correctness",
-            criteria="실제 출력이 예상 출력과 비교하여 정확한지 판단합니다.",
-            evaluation_params=[
-                LLMTestCaseParams.INPUT,
-                LLMTestCaseParams.ACTUAL_OUTPUT,
-                LLMTestCaseParams.EXPECTED_OUTPUT,
-            ],
-            threshold=threshold,
-            model=model,
-        )
+        super().__init__(model, threshold, max_concurrent, cache)
+        self.batch_size = batch_size
+
+        # Correctness 메트릭 초기화 (배치 모드에서는 여러 케이스를 한 요청으로 채점)
+        if batch_size:
+            self.correctness_metric = BatchGEval(
+                name="Correctness",
+                criteria=CORRECTNESS_CRITERIA,
+                threshold=threshold,
+                model=model,
+            )
+        else:
+            self.correctness_metric = GEval(
+                name="Correctness",
+                criteria=CORRECTNESS_CRITERIA,
+                evaluation_steps=CORRECTNESS_STEPS,
+                evaluation_params=[
+                    LLMTestCaseParams.INPUT,
+                    LLMTestCaseParams.ACTUAL_OUTPUT,
+                    LLMTestCaseParams.EXPECTED_OUTPUT,
+                ],
+                threshold=threshold,
+                model=model,
+            )
 
         # Answer Relevancy 메트릭 초기화
-        self.answer_relevancy_metric = AnswerRelevancyMetric(
-            threshold=threshold,
-            model=model,
-        )
+        self.answer_relevancy_metric = get_metric(AnswerRelevancyMetric, threshold, model)
 
-    def evaluate(self, test_cases: List[Any]) -> Dict[str, Any]:
+    def evaluate(
+        self,
+        test_cases: List[Any],
+        results_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
         """
         Agent 테스트 케이스를 평가합니다.
 
         Args:
             test_cases: AgentTestCase 객체 리스트
+            results_path: 개별 결과를 스트리밍할 JSONL 파일 경로 (None이면 메모리에 보관)
 
         Returns:
             점수와 통과/실패 상태를 포함하는 평가 결과 딕셔너리
         """
+        return self.run(self.a_evaluate(test_cases, results_path))
+
+    async def a_evaluate(
+        self,
+        test_cases: List[Any],
+        results_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """
+        Agent 테스트 케이스를 비동기로 동시에 평가합니다.
+
+        results_path를 지정하면 개별 결과를 메모리 대신 JSONL 파일에 기록하고,
+        파일에 이미 기록된 케이스는 다시 평가하지 않고 점수만 가져옵니다.
+
+        Args:
+            test_cases: AgentTestCase 객체 리스트
+            results_path: 개별 결과를 스트리밍할 JSONL 파일 경로 (None이면 메모리에 보관)
+
+        Returns:
+            점수와 통과/실패 상태를 포함하는 평가 결과 딕셔너리
+        """
+        # 이전 실행에서 기록된 케이스는 건너뛰고 나머지만 평가
+        stream = ResultsStream(results_path) if results_path else None
+        completed = stream.completed_results(test_cases) if stream else {}
+        pending = [i for i in range(len(test_cases)) if i not in completed]
+
+        # 비어 있는 케이스는 judge를 호출하지 않고 0점으로 처리
+        skipped = [i for i in pending if self.is_degenerate(test_cases[i])]
+        skipped_ids = set(skipped)
+        pending = [i for i in pending if i not in skipped_ids]
+
+        # 내용이 같은 케이스는 한 번만 채점하고 결과를 나눠 씀
+        unique_indices, case_positions = self.deduplicate([
+            (test_cases[i].input, test_cases[i].actual_output, test_cases[i].expected_output)
+            for i in pending
+        ])
+
+        unique_cases = [test_cases[pending[j]] for j in unique_indices]
+
+        # 케이스 수를 알고 있으므로 결과 리스트를 미리 할당하고 인덱스로 채움
+        total_cases = len(test_cases)
         results = {
-            "total_cases": len(test_cases),
-            "correctness_scores": [],
-            "answer_relevancy_scores": [],
-            "individual_results": [],
+            "total_cases": total_cases,
+            "correctness_scores": [0.0] * total_cases,
+            "answer_relevancy_scores": [0.0] * total_cases,
         }
+        if stream is None:
+            results["individual_results"] = [None] * total_cases
+        else:
+            # 개별 결과는 파일에만 기록하고 메모리에는 점수만 유지
+            results["results_path"] = str(stream.path)
 
-        for i, test_case in enumerate(test_cases):
-            # DeepEval 테스트 케이스 형식으로 변환
-            llm_test_case = LLMTestCase(
-                input=test_case.input,
-                actual_output=test_case.actual_output,
-                expected_output=test_case.expected_output,
-            )
+        # 이전 실행에서 기록된 케이스는 점수만 가져옴
+        for i, individual_result in completed.items():
+            results["correctness_scores"][i] = individual_result["correctness"]["score"]
+            results["answer_relevancy_scores"][i] = individual_result["answer_relevancy"]["score"]
 
-            # Correctness 평가
-            self.correctness_metric.measure(llm_test_case)
-            correctness_score = self.correctness_metric.score
+        # 기록할 때마다 참조하는 임계값은 지역 변수로 둠
+        threshold = self.threshold
 
-            # Answer Relevancy 평가
-            self.answer_relevancy_metric.measure(llm_test_case)
-            answer_relevancy_score = self.answer_relevancy_metric.score
+        def record(i, scores):
+            """케이스 하나의 점수를 저장하고 개별 결과를 기록합니다."""
+            (correctness_score, correctness_reason), (answer_relevancy_score, answer_relevancy_reason) = scores
+            test_case = test_cases[i]
 
             # 점수 저장
-            results["correctness_scores"].append(correctness_score)
-            results["answer_relevancy_scores"].append(answer_relevancy_score)
+            results["correctness_scores"][i] = correctness_score
+            results["answer_relevancy_scores"][i] = answer_relevancy_score
 
             # 개별 결과
             individual_result = {
@@ -90,33 +183,98 @@ class AgentEvaluator(BaseEvaluator):
                 "input": test_case.input,
                 "actual_output": test_case.actual_output,
                 "expected_output": test_case.expected_output,
-                "correctness": {
-                    "score": correctness_score,
-                    "passed": self.check_pass_threshold(correctness_score),
-                    "reason": self.correctness_metric.reason,
-                },
-                "answer_relevancy": {
-                    "score": answer_relevancy_score,
-                    "passed": self.check_pass_threshold(answer_relevancy_score),
-                    "reason": self.answer_relevancy_metric.reason,
-                },
+                "correctness": MetricResult(
+                    correctness_score, correctness_score >= threshold, correctness_reason
+                ).to_dict(),
+                "answer_relevancy": MetricResult(
+                    answer_relevancy_score, answer_relevancy_score >= threshold, answer_relevancy_reason
+                ).to_dict(),
+            }
+            if i in skipped_ids:
+                individual_result["skipped"] = True
+            if stream is None:
+                results["individual_results"][i] = individual_result
+            else:
+                stream.write(individual_result)
+
+        try:
+            skipped_result = (0.0, self.skipped_reason)
+            for i in skipped:
+                record(i, (skipped_result, skipped_result))
+
+            # 캐시된 결과를 먼저 채우고, 캐시에 없는 케이스만 측정
+            unique_correctness = self.lookup_cache(self.correctness_metric, unique_cases)
+            unique_answer_relevancy = self.lookup_cache(self.answer_relevancy_metric, unique_cases)
+            correctness_misses = [
+                j for j in range(len(unique_cases)) if unique_correctness[j] is None
+            ]
+            answer_relevancy_misses = [
+                j for j in range(len(unique_cases)) if unique_answer_relevancy[j] is None
+            ]
+
+            # DeepEval 테스트 케이스 형식으로 변환 (측정할 케이스만)
+            llm_test_cases = {
+                j: LLMTestCase(
+                    input=unique_cases[j].input,
+                    actual_output=unique_cases[j].actual_output,
+                    expected_output=unique_cases[j].expected_output,
+                )
+                for j in set(correctness_misses).union(answer_relevancy_misses)
             }
-            results["individual_results"].append(individual_result)
+            semaphore = asyncio.Semaphore(self.max_concurrent)
 
-        # 평균 계산
-        results["average_correctness"] = self.calculate_average_score(
-            results["correctness_scores"]
+            async def measure(metric, llm_test_case):
+                async with semaphore:
+                    measured = await self.a_measure_metric(
+                        metric, llm_test_case, check_cache=False
+                    )
+                return measured.score, measured.reason
+
+            # 배치 모드에서는 케이스가 속한 배치가 끝나면 Correctness 점수가 나옴
+            if self.batch_size:
+                correctness_batches = dict(zip(
+                    correctness_misses,
+                    self._schedule_correctness_batches(
+                        [llm_test_cases[j] for j in correctness_misses], semaphore
+                    ),
+                ))
+
+            async def correctness_of(j):
+                if unique_correctness[j] is not None:
+                    return unique_correctness[j]
+                if self.batch_size:
+                    return await correctness_batches[j]
+                return await measure(self.correctness_metric, llm_test_cases[j])
+
+            async def answer_relevancy_of(j):
+                if unique_answer_relevancy[j] is not None:
+                    return unique_answer_relevancy[j]
+                return await measure(self.answer_relevancy_metric, llm_test_cases[j])
+
+            async def measure_case(j):
+                return await asyncio.gather(correctness_of(j), answer_relevancy_of(j))
+
+            await self.a_measure_unique_cases(pending, case_positions, measure_case, record)
+        finally:
+            if stream is not None:
+                stream.close()
+        results["skipped_cases"] = len(skipped)
+
+        # 평균 계산 (메트릭별 합계를 전체 평균에도 재사용)
+        correctness_sum = sum(results["correctness_scores"])
+        answer_relevancy_sum = sum(results["answer_relevancy_scores"])
+        results["average_correctness"] = (
+            correctness_sum / total_cases if total_cases else 0.0
         )
-        results["average_answer_relevancy"] = self.calculate_average_score(
-            results["answer_relevancy_scores"]
+        results["average_answer_relevancy"] = (
+            answer_relevancy_sum / total_cases if total_cases else 0.0
         )
 
         # 전체 평균
-        all_scores = (
-            results["correctness_scores"]
-            + results["answer_relevancy_scores"]
+        results["overall_average"] = (
+            (correctness_sum + answer_relevancy_sum) / (2 * total_cases)
+            if total_cases else 0.0
         )
-        results["overall_average"] = self.calculate_average_score(all_scores)
 
         # 통과/실패 판정
         results["passed"] = (
@@ -127,6 +285,50 @@ class AgentEvaluator(BaseEvaluator):
 
         return results
 
+    def _schedule_correctness_batches(
+        self,
+        llm_test_cases: List[LLMTestCase],
+        semaphore: asyncio.Semaphore,
+    ) -> List[Awaitable[Tuple[float, str]]]:
+        """
+        테스트 케이스를 batch_size 단위로 묶어 Correctness 채점을 시작합니다.
+        캐시가 설정되어 있으면 채점 결과를 캐시에 저장합니다.
+
+        배치마다 태스크를 바로 만들므로 실행 중인 이벤트 루프에서 호출해야 합니다.
+
+        Args:
+            llm_test_cases: 캐시에 없는 DeepEval 테스트 케이스 리스트
+            semaphore: 동시 요청 수를 제한하는 세마포어
+
+        Returns:
+            입력 순서와 같은 awaitable 리스트 (케이스가 속한 배치가 끝나면 (점수, 이유)를 반환)
+        """
+        async def measure_batch(indices):
+            async with semaphore:
+                scored = await self.correctness_metric.a_measure_batch(
+                    [llm_test_cases[i] for i in indices]
+                )
+            if self.cache:
+                for i, (score, reason) in zip(indices, scored):
+                    self.cache.set(
+                        self.cache_key(self.correctness_metric, llm_test_cases[i]),
+                        score,
+                        reason,
+                    )
+            return scored
+
+        batch_tasks = [
+            asyncio.create_task(
+                measure_batch(range(start, min(start + self.batch_size, len(llm_test_cases))))
+            )
+            for start in range(0, len(llm_test_cases), self.batch_size)
+        ]
+
+        async def score(i):
+            return (await batch_tasks[i // self.batch_size])[i % self.batch_size]
+
+        return [score(i) for i in range(len(llm_test_cases))]
+
     def generate_report(self, results: Dict[str, Any]) -> str:
         """
         사람이 읽을 수 있는 평가 보고서를 생성합니다.
@@ -137,16 +339,7 @@ class AgentEvaluator(BaseEvaluator):
         Returns:
             포맷된 보고서 문자열
         """
-        report = []
-        report.append("=" * 60)
-        report.append("AGENT SYSTEM EVALUATION REPORT")
-        report.append("=" * 60)
-        report.append(f"\nTotal Test Cases: {results['total_cases']}")
-        report.append(f"\nAverage Scores:")
-        report.append(f"  - Correctness: {results['average_correctness']:.3f}")
-        report.append(f"  - Answer Relevancy: {results['average_answer_relevancy']:.3f}")
-        report.append(f"\nOverall Average: {results['overall_average']:.3f}")
-        report.append(f"Status: {'✅ PASSED' if results['passed'] else '❌ FAILED'}")
-        report.append("\n" + "=" * 60)
-
-        return "\n".join(report)
+        return _REPORT_TEMPLATE.format(
+            **results,
+            status="✅ PASSED" if results["passed"] else "❌ FAILED",
+        )
@@ -1,11 +1,35 @@
 """
 LLM 시스템 평가를 위한 기본 평가자 클래스
 """
-from typing import List, Dict, Any, Optional
+import asyncio
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from dataclasses import dataclass
+from typing import List, Dict, Any, Awaitable, Callable, Coroutine, Hashable, Optional, Tuple, Type
 from abc import ABC, abstractmethod
+from deepeval.metrics import BaseMetric
 from deepeval.models import DeepEvalBaseLLM
+from deepeval.test_case import LLMTestCase
+import httpx
 from google import genai
 from google.genai import types
+from pydantic import BaseModel
+from ..utils.cache import JudgeCache, ResponseCache
+from ..utils.rate_limiter import AsyncTokenBucket, estimate_tokens
+
+
+@dataclass(slots=True)
+class MetricResult:
+    """테스트 케이스 하나에 대한 메트릭 하나의 측정 결과"""
+
+    score: float
+    passed: bool
+    reason: Optional[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """결과 딕셔너리에 들어갈 형식으로 변환합니다."""
+        return {"score": self.score, "passed": self.passed, "reason": self.reason}
 
 
 class GeminiModel(DeepEvalBaseLLM):
@@ -15,16 +39,45 @@ class GeminiModel(DeepEvalBaseLLM):
         self,
         model: str = "gemini-2.0-flash-exp",
         api_key: Optional[str] = None,
+        max_connections: int = 64,
+        max_attempts: int = 5,
+        max_retry_delay: float = 30.0,
+        rate_limiter: Optional[AsyncTokenBucket] = None,
+        response_cache: Optional[ResponseCache] = None,
     ):
         """
         Gemini 모델을 초기화합니다.
 
+        클라이언트는 한 번만 만들어 재사용하므로 동시 요청이 커넥션 풀을 공유합니다.
+        408, 429, 5xx 응답은 SDK가 지터를 더한 지수 백오프로 재시도합니다.
+
         Args:
             model: Gemini 모델 이름
             api_key: Google API 키
+            max_connections: 커넥션 풀에서 유지할 최대 연결 수
+            max_attempts: 첫 요청을 포함한 최대 시도 횟수
+            max_retry_delay: 재시도 사이 대기 시간의 상한(초)
+            rate_limiter: 요청 전에 대기할 RPM/TPM 토큰 버킷 (None이면 제한 없음)
+            response_cache: 같은 프롬프트의 응답을 재사용할 메모리 캐시 (None이면 캐시 사용 안 함)
         """
         self.model_name = model
-        self.client = genai.Client(api_key=api_key)
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                client_args={"limits": limits},
+                async_client_args={"limits": limits},
+                retry_options=types.HttpRetryOptions(
+                    attempts=max_attempts,
+                    max_delay=max_retry_delay,
+                ),
+            ),
+        )
 
     def load_model(self):
         """모델을 로드합니다 (API 기반 모델에는 필요 없음)."""
@@ -40,11 +93,18 @@ class GeminiModel(DeepEvalBaseLLM):
         Returns:
             생성된 텍스트 응답
         """
+        key = self._cache_key(prompt)
+        cached = self._cached_text(key)
+        if cached is not None:
+            return cached
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire_sync(estimate_tokens(prompt))
         response = self.client.models.generate_content(
             model=self.model_name,
             contents=prompt,
         )
-        return response.text
+        return self._store_text(key, response.text)
 
     async def a_generate(self, prompt: str) -> str:
         """
@@ -56,11 +116,96 @@ class GeminiModel(DeepEvalBaseLLM):
         Returns:
             생성된 텍스트 응답
         """
+        key = self._cache_key(prompt)
+        cached = self._cached_text(key)
+        if cached is not None:
+            return cached
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(estimate_tokens(prompt))
+        response = await self.client.aio.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+        )
+        return self._store_text(key, response.text)
+
+    def generate_json(self, prompt: str, schema: Type[BaseModel]) -> BaseModel:
+        """
+        JSON 응답 모드로 스키마에 맞는 응답을 생성합니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            schema: 응답을 파싱할 Pydantic 모델
+
+        Returns:
+            스키마로 검증된 응답 객체
+        """
+        key = self._cache_key(prompt, schema)
+        cached = self._cached_text(key)
+        if cached is not None:
+            return schema.model_validate_json(cached)
+
+        if self.rate_limiter:
+            self.rate_limiter.acquire_sync(estimate_tokens(prompt))
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._json_config(schema),
+        )
+        return schema.model_validate_json(self._store_text(key, response.text))
+
+    async def a_generate_json(self, prompt: str, schema: Type[BaseModel]) -> BaseModel:
+        """
+        JSON 응답 모드로 스키마에 맞는 응답을 비동기적으로 생성합니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            schema: 응답을 파싱할 Pydantic 모델
+
+        Returns:
+            스키마로 검증된 응답 객체
+        """
+        key = self._cache_key(prompt, schema)
+        cached = self._cached_text(key)
+        if cached is not None:
+            return schema.model_validate_json(cached)
+
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(estimate_tokens(prompt))
         response = await self.client.aio.models.generate_content(
             model=self.model_name,
             contents=prompt,
+            config=self._json_config(schema),
+        )
+        return schema.model_validate_json(self._store_text(key, response.text))
+
+    def _cache_key(self, prompt: str, schema: Optional[Type[BaseModel]] = None) -> Optional[str]:
+        """응답 캐시 키를 계산합니다 (캐시를 사용하지 않으면 None)."""
+        if self.response_cache is None:
+            return None
+        return ResponseCache.make_key(
+            self.model_name, prompt, schema.__name__ if schema else None
+        )
+
+    def _cached_text(self, key: Optional[str]) -> Optional[str]:
+        """캐시된 응답 텍스트를 반환합니다 (없으면 None)."""
+        if key is None:
+            return None
+        return self.response_cache.get(key)
+
+    def _store_text(self, key: Optional[str], text: str) -> str:
+        """응답 텍스트를 캐시에 저장하고 그대로 반환합니다."""
+        if key is not None:
+            self.response_cache.set(key, text)
+        return text
+
+    @staticmethod
+    def _json_config(schema: Type[BaseModel]) -> types.GenerateContentConfig:
+        """JSON 응답 모드 생성 설정을 만듭니다."""
+        return types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=schema,
         )
-        return response.text
 
     def get_model_name(self) -> str:
         """모델 이름을 반환합니다."""
@@ -70,10 +215,17 @@ class GeminiModel(DeepEvalBaseLLM):
 class BaseEvaluator(ABC):
     """모든 평가자의 기본 클래스"""
 
+    __slots__ = ("model", "threshold", "max_concurrent", "cache", "_sync_executor")
+
+    # judge 호출 없이 0점 처리한 케이스의 평가 이유
+    skipped_reason = "skipped: empty input/output"
+
     def __init__(
         self,
         model: DeepEvalBaseLLM,
         threshold: float = 0.7,
+        max_concurrent: int = 10,
+        cache: Optional[JudgeCache] = None,
     ):
         """
         기본 평가자를 초기화합니다.
@@ -81,9 +233,15 @@ class BaseEvaluator(ABC):
         Args:
             model: DeepEval 모델 인스턴스
             threshold: 통과 최소 점수 임계값
+            max_concurrent: 동시에 평가할 최대 테스트 케이스 수
+            cache: judge 응답 캐시 (None이면 캐시 사용 안 함)
         """
         self.model = model
         self.threshold = threshold
+        self.max_concurrent = max_concurrent
+        self.cache = cache
+        # 동기 전용 메트릭을 측정할 스레드 풀 (처음 필요할 때 생성)
+        self._sync_executor: Optional[ThreadPoolExecutor] = None
 
     @abstractmethod
     def evaluate(self, test_cases: List[Any]) -> Dict[str, Any]:
@@ -98,6 +256,32 @@ class BaseEvaluator(ABC):
         """
         pass
 
+    def run(self, coroutine: Coroutine[Any, Any, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        평가 코루틴을 새 이벤트 루프에서 실행하고, 끝나면 스레드 풀을 정리합니다.
+
+        Args:
+            coroutine: 실행할 a_evaluate 코루틴
+
+        Returns:
+            코루틴이 반환한 평가 결과 딕셔너리
+        """
+        try:
+            return asyncio.run(coroutine)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        동기 전용 메트릭을 측정하던 스레드 풀을 종료합니다.
+
+        evaluate()는 끝날 때 자동으로 호출하므로 a_evaluate를 직접 사용한 경우에만 호출하면 됩니다.
+        이후 다시 측정하면 스레드 풀을 새로 만듭니다.
+        """
+        if self._sync_executor is not None:
+            self._sync_executor.shutdown()
+            self._sync_executor = None
+
     def calculate_average_score(self, scores: List[float]) -> float:
         """
         점수 리스트로부터 평균 점수를 계산합니다.
@@ -123,3 +307,185 @@ class BaseEvaluator(ABC):
             점수가 임계값 이상이면 True
         """
         return score >= self.threshold
+
+    def is_degenerate(self, test_case: Any) -> bool:
+        """
+        입력이나 출력이 비어 있어 judge를 호출할 필요가 없는 케이스인지 확인합니다.
+
+        이런 케이스는 측정하지 않고 고정 점수 0.0으로 처리합니다.
+
+        Args:
+            test_case: 테스트 케이스 객체
+
+        Returns:
+            입력 또는 출력이 비어 있으면 True
+        """
+        return not test_case.input or not test_case.actual_output
+
+    def deduplicate(self, keys: List[Hashable]) -> Tuple[List[int], List[int]]:
+        """
+        내용이 같은 테스트 케이스를 묶어 중복 judge 호출을 피합니다.
+
+        Args:
+            keys: 테스트 케이스별 내용 키 (같은 키는 같은 케이스로 취급)
+
+        Returns:
+            (고유 케이스의 원래 인덱스 리스트, 케이스별 고유 케이스 위치 리스트) 튜플
+        """
+        positions: Dict[Hashable, int] = {}
+        unique_indices = []
+        case_positions = [0] * len(keys)
+        for i in range(len(keys)):
+            key = keys[i]
+            position = positions.get(key)
+            if position is None:
+                position = positions[key] = len(unique_indices)
+                unique_indices.append(i)
+            case_positions[i] = position
+        return unique_indices, case_positions
+
+    async def a_measure_case(
+        self,
+        metrics: List[BaseMetric],
+        llm_test_case: LLMTestCase,
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[float, str]]:
+        """
+        테스트 케이스 하나를 여러 메트릭으로 동시에 측정합니다.
+
+        케이스끼리 같은 세마포어를 공유하므로 전체 동시 측정 수는 max_concurrent로 제한됩니다.
+
+        Args:
+            metrics: 측정에 사용할 DeepEval 메트릭 리스트
+            llm_test_case: DeepEval 테스트 케이스
+            semaphore: 동시 측정 수를 제한하는 세마포어
+
+        Returns:
+            metrics 순서의 (점수, 이유) 튜플 리스트
+        """
+        async def measure(metric):
+            async with semaphore:
+                measured = await self.a_measure_metric(metric, llm_test_case)
+            return measured.score, measured.reason
+
+        return await asyncio.gather(*(measure(metric) for metric in metrics))
+
+    async def a_measure_unique_cases(
+        self,
+        pending: List[int],
+        case_positions: List[int],
+        measure_case: Callable[[int], Awaitable[Any]],
+        record: Callable[[int, Any], None],
+    ) -> None:
+        """
+        중복을 제거한 고유 케이스를 동시에 측정하고, 측정이 끝난 케이스부터 바로 결과를 기록합니다.
+
+        고유 케이스의 결과는 내용이 같은 원래 케이스 모두에 기록됩니다. 결과를 파일로 스트리밍하면
+        실행이 중간에 중단되어도 그때까지 끝난 케이스는 파일에 남아 다음 실행에서 건너뜁니다.
+
+        Args:
+            pending: 측정할 케이스의 원래 인덱스 리스트
+            case_positions: deduplicate가 반환한 pending 케이스별 고유 케이스 위치 리스트
+            measure_case: 고유 케이스 위치를 받아 측정 결과를 반환하는 코루틴 함수
+            record: 원래 인덱스와 측정 결과를 받아 결과를 기록하는 함수
+        """
+        groups: Dict[int, List[int]] = {}
+        for i, position in zip(pending, case_positions):
+            groups.setdefault(position, []).append(i)
+
+        async def finish(position):
+            result = await measure_case(position)
+            for i in groups[position]:
+                record(i, result)
+
+        await asyncio.gather(*(finish(position) for position in groups))
+
+    async def a_measure_metric(
+        self,
+        metric: BaseMetric,
+        llm_test_case: LLMTestCase,
+        check_cache: bool = True,
+    ) -> BaseMetric:
+        """
+        메트릭의 복사본으로 테스트 케이스를 비동기 측정합니다.
+
+        측정 결과가 메트릭 인스턴스의 score/reason에 기록되므로,
+        동시에 실행되는 측정끼리 덮어쓰지 않도록 케이스마다 얕은 복사본을 사용합니다.
+        async_mode=False인 메트릭은 동기 measure를 스레드 풀에서 실행하므로
+        이 경우에도 max_concurrent만큼 동시에 측정됩니다.
+        캐시가 설정되어 있으면 캐시된 결과를 먼저 조회합니다.
+
+        Args:
+            metric: 측정에 사용할 DeepEval 메트릭
+            llm_test_case: DeepEval 테스트 케이스
+            check_cache: False이면 캐시 조회를 건너뜀 (이미 lookup_cache로 확인한 경우)
+
+        Returns:
+            score와 reason이 채워진 메트릭 복사본
+        """
+        measured = copy.copy(metric)
+
+        key = self.cache_key(metric, llm_test_case) if self.cache else None
+        cached = self.cache.get(key) if key and check_cache else None
+        if cached is not None:
+            measured.score, measured.reason = cached
+            return measured
+
+        if getattr(metric, "async_mode", True):
+            await measured.a_measure(llm_test_case, _show_indicator=False)
+        else:
+            # 비동기 측정을 지원하지 않는 메트릭은 스레드에서 동기 측정 (이벤트 루프를 막지 않음)
+            if self._sync_executor is None:
+                self._sync_executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent, thread_name_prefix="metric"
+                )
+            await asyncio.get_running_loop().run_in_executor(
+                self._sync_executor,
+                partial(measured.measure, llm_test_case, _show_indicator=False),
+            )
+
+        if key:
+            self.cache.set(key, measured.score, measured.reason)
+        return measured
+
+    def lookup_cache(
+        self,
+        metric: Any,
+        test_cases: List[Any],
+    ) -> List[Optional[Tuple[float, str]]]:
+        """
+        LLMTestCase로 변환하기 전에 케이스별 캐시된 결과를 조회합니다.
+
+        Args:
+            metric: 측정에 사용할 메트릭
+            test_cases: 테스트 케이스 객체 리스트
+
+        Returns:
+            케이스별 (점수, 이유) 튜플 리스트 (캐시에 없으면 None)
+        """
+        if not self.cache:
+            return [None] * len(test_cases)
+        return [self.cache.get(self.cache_key(metric, tc)) for tc in test_cases]
+
+    def cache_key(self, metric: Any, llm_test_case: Any) -> str:
+        """
+        메트릭과 테스트 케이스로 judge 캐시 키를 계산합니다.
+
+        Args:
+            metric: 측정에 사용할 메트릭
+            llm_test_case: DeepEval 테스트 케이스 또는 같은 필드를 가진 테스트 케이스 객체
+
+        Returns:
+            캐시 키
+        """
+        return JudgeCache.make_key([
+            self.model.get_model_name(),
+            type(metric).__name__,
+            getattr(metric, "name", None),
+            getattr(metric, "criteria", None),
+            getattr(metric, "evaluation_steps", None),
+            llm_test_case.input,
+            llm_test_case.actual_output,
+            getattr(llm_test_case, "expected_output", None),
+            getattr(llm_test_case, "retrieval_context", None),
+        ])
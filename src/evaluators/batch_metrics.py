@@ -0,0 +1,219 @@
+"""
+judge 요청을 하나로 묶어 채점하는 배치 메트릭
+케이스마다 judge LLM을 호출하는 대신 K개의 케이스를 한 프롬프트에 담거나(BatchGEval),
+한 케이스의 여러 기준을 한 프롬프트로 채점해(CombinedGEval) 왕복 횟수를 줄입니다.
+"""
+import json
+from typing import Dict, List, Tuple
+from deepeval.models import DeepEvalBaseLLM
+from deepeval.test_case import LLMTestCase
+from pydantic import BaseModel, Field
+
+
+class BatchScore(BaseModel):
+    """배치 내 개별 케이스의 채점 결과"""
+    index: int = Field(..., description="배치 내 케이스 번호")
+    score: float = Field(..., description="0-10 사이의 점수")
+    reason: str = Field(..., description="점수에 대한 근거")
+
+
+class BatchScores(BaseModel):
+    """배치 채점 응답 스키마"""
+    results: List[BatchScore]
+
+
+class BatchGEval:
+    """여러 테스트 케이스를 한 번의 LLM 호출로 채점하는 G-Eval 방식 메트릭"""
+
+    def __init__(
+        self,
+        name: str,
+        criteria: str,
+        model: DeepEvalBaseLLM,
+        threshold: float = 0.5,
+    ):
+        """
+        배치 G-Eval 메트릭을 초기화합니다.
+
+        Args:
+            name: 메트릭 이름
+            criteria: 채점 기준
+            model: DeepEval 모델 인스턴스
+            threshold: 통과 최소 점수 임계값
+        """
+        self.name = name
+        self.criteria = criteria
+        self.model = model
+        self.threshold = threshold
+
+    async def a_measure_batch(
+        self, test_cases: List[LLMTestCase]
+    ) -> List[Tuple[float, str]]:
+        """
+        테스트 케이스 묶음을 한 번의 요청으로 채점합니다.
+
+        Args:
+            test_cases: 채점할 DeepEval 테스트 케이스 리스트
+
+        Returns:
+            입력 순서와 같은 (점수, 이유) 튜플 리스트 (점수는 0-1로 정규화)
+
+        Raises:
+            ValueError: 응답에 일부 케이스의 점수가 없을 경우
+        """
+        prompt = self._build_prompt(test_cases)
+
+        if hasattr(self.model, "a_generate_json"):
+            scores = await self.model.a_generate_json(prompt, BatchScores)
+        else:
+            response = await self.model.a_generate(prompt)
+            scores = self._parse_response(response)
+
+        return self._collect_scores(scores, len(test_cases))
+
+    def _build_prompt(self, test_cases: List[LLMTestCase]) -> str:
+        """채점 기준과 케이스 목록으로 배치 채점 프롬프트를 만듭니다."""
+        cases = [
+            {
+                "index": i,
+                "input": test_case.input,
+                "actual_output": test_case.actual_output,
+                "expected_output": test_case.expected_output,
+            }
+            for i, test_case in enumerate(test_cases)
+        ]
+
+        return (
+            "You are an evaluator. Score each of the following "
+            f"{len(cases)} test cases independently against the criteria.\n\n"
+            f"Criteria:\n{self.criteria}\n\n"
+            "Give every case an integer score from 0 (worst) to 10 (best) "
+            "and a concise reason.\n"
+            'Return JSON only, in the form {"results": [{"index": <int>, '
+            '"score": <int>, "reason": <string>}, ...]}, '
+            "with exactly one entry per case index.\n\n"
+            f"Test cases:\n{json.dumps(cases, ensure_ascii=False, indent=2)}"
+        )
+
+    @staticmethod
+    def _parse_response(response: str) -> BatchScores:
+        """JSON 모드를 지원하지 않는 모델의 텍스트 응답을 파싱합니다."""
+        start = response.find("{")
+        end = response.rfind("}") + 1
+        return BatchScores.model_validate_json(response[start:end])
+
+    @staticmethod
+    def _collect_scores(scores: BatchScores, size: int) -> List[Tuple[float, str]]:
+        """응답을 케이스 순서대로 정렬하고 점수를 0-1 범위로 정규화합니다."""
+        by_index = {result.index: result for result in scores.results}
+        missing = [i for i in range(size) if i not in by_index]
+        if missing:
+            raise ValueError(f"Batch judge response is missing cases: {missing}")
+
+        return [
+            (min(max(by_index[i].score, 0.0), 10.0) / 10, by_index[i].reason)
+            for i in range(size)
+        ]
+
+
+class CriterionScore(BaseModel):
+    """통합 채점 응답의 기준별 결과"""
+    name: str = Field(..., description="채점 기준 이름")
+    score: float = Field(..., description="0-10 사이의 점수")
+    reason: str = Field(..., description="점수에 대한 근거")
+
+
+class CriterionScores(BaseModel):
+    """통합 채점 응답 스키마"""
+    results: List[CriterionScore]
+
+
+class CombinedGEval:
+    """테스트 케이스 하나를 여러 기준으로 한 번의 LLM 호출에 채점하는 G-Eval 방식 메트릭"""
+
+    def __init__(
+        self,
+        name: str,
+        criteria: Dict[str, str],
+        model: DeepEvalBaseLLM,
+        threshold: float = 0.5,
+    ):
+        """
+        통합 G-Eval 메트릭을 초기화합니다.
+
+        Args:
+            name: 메트릭 이름
+            criteria: 기준 이름별 채점 기준 (결과는 이 순서대로 반환)
+            model: DeepEval 모델 인스턴스
+            threshold: 통과 최소 점수 임계값
+        """
+        self.name = name
+        self.criteria = criteria
+        self.model = model
+        self.threshold = threshold
+
+    async def a_measure(self, test_case: LLMTestCase) -> List[Tuple[float, str]]:
+        """
+        테스트 케이스를 모든 기준에 대해 한 번의 요청으로 채점합니다.
+
+        Args:
+            test_case: 채점할 DeepEval 테스트 케이스
+
+        Returns:
+            criteria 순서와 같은 (점수, 이유) 튜플 리스트 (점수는 0-1로 정규화)
+
+        Raises:
+            ValueError: 응답에 일부 기준의 점수가 없을 경우
+        """
+        prompt = self._build_prompt(test_case)
+
+        if hasattr(self.model, "a_generate_json"):
+            scores = await self.model.a_generate_json(prompt, CriterionScores)
+        else:
+            response = await self.model.a_generate(prompt)
+            scores = self._parse_response(response)
+
+        return self._collect_scores(scores)
+
+    def _build_prompt(self, test_case: LLMTestCase) -> str:
+        """채점 기준 목록과 케이스 내용으로 통합 채점 프롬프트를 만듭니다."""
+        case = {
+            "input": test_case.input,
+            "actual_output": test_case.actual_output,
+            "expected_output": test_case.expected_output,
+            "retrieval_context": test_case.retrieval_context,
+        }
+        criteria = "\n".join(
+            f"- {name}: {criterion}" for name, criterion in self.criteria.items()
+        )
+
+        return (
+            "You are an evaluator. Score the following test case independently "
+            f"on each of these {len(self.criteria)} criteria.\n\n"
+            f"Criteria:\n{criteria}\n\n"
+            "Give every criterion an integer score from 0 (worst) to 10 (best) "
+            "and a concise reason.\n"
+            'Return JSON only, in the form {"results": [{"name": <string>, '
+            '"score": <int>, "reason": <string>}, ...]}, '
+            "with exactly one entry per criterion name.\n\n"
+            f"Test case:\n{json.dumps(case, ensure_ascii=False, indent=2)}"
+        )
+
+    @staticmethod
+    def _parse_response(response: str) -> CriterionScores:
+        """JSON 모드를 지원하지 않는 모델의 텍스트 응답을 파싱합니다."""
+        start = response.find("{")
+        end = response.rfind("}") + 1
+        return CriterionScores.model_validate_json(response[start:end])
+
+    def _collect_scores(self, scores: CriterionScores) -> List[Tuple[float, str]]:
+        """응답을 기준 순서대로 정렬하고 점수를 0-1 범위로 정규화합니다."""
+        by_name = {result.name: result for result in scores.results}
+        missing = [name for name in self.criteria if name not in by_name]
+        if missing:
+            raise ValueError(f"Combined judge response is missing criteria: {missing}")
+
+        return [
+            (min(max(by_name[name].score, 0.0), 10.0) / 10, by_name[name].reason)
+            for name in self.criteria
+        ]
@@ -2,23 +2,66 @@
 RAG (Retrieval-Augmented Generation) 시스템 평가자
 Faithfulness, Contextual Recall, Answer Relevancy 메트릭을 사용하여 RAG 시스템을 평가합니다.
 """
-from typing import List, Dict, Any
+import asyncio
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 from deepeval.metrics import (
     FaithfulnessMetric,
     ContextualRecallMetric,
     AnswerRelevancyMetric,
 )
 from deepeval.test_case import LLMTestCase
-from .base import BaseEvaluator, DeepEvalBaseLLM
+from ._metric_registry import get_metric
+from .base import BaseEvaluator, DeepEvalBaseLLM, MetricResult
+from .batch_metrics import CombinedGEval
+from ..utils.cache import JudgeCache
+from ..utils.results_stream import ResultsStream
+
+# 통합 채점 모드에서 한 번에 채점하는 기준 (결과 딕셔너리의 메트릭 키 순서)
+RAG_CRITERIA = {
+    "faithfulness": "실제 출력의 모든 주장이 검색된 컨텍스트에 근거하는지 판단합니다.",
+    "contextual_recall": "예상 출력의 내용을 검색된 컨텍스트에서 얼마나 도출할 수 있는지 판단합니다.",
+    "answer_relevancy": "실제 출력이 입력 질문과 얼마나 관련 있는지 판단합니다.",
+}
+
+# 사람이 읽을 수 있는 보고서 템플릿
+_SEP = "=" * 60
+_HEADER = f"{_SEP}\nRAG SYSTEM EVALUATION REPORT\n{_SEP}"
+
+_REPORT_TEMPLATE = _HEADER + """
+
+Total Test Cases: {total_cases}
+
+Average Scores:
+  - Faithfulness: {average_faithfulness:.3f}
+  - Contextual Recall: {average_contextual_recall:.3f}
+  - Answer Relevancy: {average_answer_relevancy:.3f}
+
+Overall Average: {overall_average:.3f}
+Status: {status}
+
+""" + _SEP
 
 
 class RAGEvaluator(BaseEvaluator):
     """RAG 시스템 평가자"""
 
+    __slots__ = (
+        "faithfulness_metric",
+        "contextual_recall_metric",
+        "answer_relevancy_metric",
+        "combined_metric",
+    )
+
+    skipped_reason = "skipped: empty input/output/context"
+
     def __init__(
         self,
         model: DeepEvalBaseLLM,
         threshold: float = 0.7,
+        max_concurrent: int = 10,
+        cache: Optional[JudgeCache] = None,
+        combined: bool = False,
     ):
         """
         RAG 평가자를 초기화합니다.
@@ -26,66 +69,144 @@ class RAGEvaluator(BaseEvaluator):
         Args:
             model: DeepEval 모델 인스턴스
             threshold: 통과 최소 점수 임계값
+            max_concurrent: 동시에 평가할 최대 테스트 케이스 수
+            cache: judge 응답 캐시 (None이면 캐시 사용 안 함)
+            combined: True이면 세 메트릭을 케이스마다 한 번의 요청으로 함께 채점
         """
-        super().__init__(model, threshold)
+        super().__init__(model, threshold, max_concurrent, cache)
 
-        # 메트릭 초기화
-        self.faithfulness_metric = FaithfulnessMetric(
-            threshold=threshold,
-            model=model,
-        )
-        self.contextual_recall_metric = ContextualRecallMetric(
-            threshold=threshold,
-            model=model,
-        )
-        self.answer_relevancy_metric = AnswerRelevancyMetric(
-            threshold=threshold,
-            model=model,
+        # 통합 채점 메트릭 초기화 (None이면 메트릭별로 DeepEval 측정)
+        self.combined_metric = (
+            CombinedGEval(
+                name="Combined RAG",
+                criteria=RAG_CRITERIA,
+                threshold=threshold,
+                model=model,
+            )
+            if combined
+            else None
         )
 
-    def evaluate(self, test_cases: List[Any]) -> Dict[str, Any]:
+        # 메트릭 초기화
+        self.faithfulness_metric = get_metric(FaithfulnessMetric, threshold, model)
+        self.contextual_recall_metric = get_metric(ContextualRecallMetric, threshold, model)
+        self.answer_relevancy_metric = get_metric(AnswerRelevancyMetric, threshold, model)
+
+    def is_degenerate(self, test_case: Any) -> bool:
+        """
+        입력, 출력 또는 검색 컨텍스트가 비어 있어 judge를 호출할 필요가 없는 케이스인지 확인합니다.
+
+        Args:
+            test_case: RAGTestCase 객체
+
+        Returns:
+            입력, 출력 또는 컨텍스트가 비어 있으면 True
+        """
+        return super().is_degenerate(test_case) or not test_case.context
+
+    def evaluate(
+        self,
+        test_cases: List[Any],
+        results_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
         """
         RAG 테스트 케이스를 평가합니다.
 
         Args:
             test_cases: RAGTestCase 객체 리스트
+            results_path: 개별 결과를 스트리밍할 JSONL 파일 경로 (None이면 메모리에 보관)
 
         Returns:
             점수와 통과/실패 상태를 포함하는 평가 결과 딕셔너리
         """
-        results = {
-            "total_cases": len(test_cases),
-            "faithfulness_scores": [],
-            "contextual_recall_scores": [],
-            "answer_relevancy_scores": [],
-            "individual_results": [],
-        }
+        return self.run(self.a_evaluate(test_cases, results_path))
+
+    async def a_evaluate(
+        self,
+        test_cases: List[Any],
+        results_path: Optional[Path] = None,
+    ) -> Dict[str, Any]:
+        """
+        RAG 테스트 케이스를 비동기로 동시에 평가합니다.
+
+        results_path를 지정하면 개별 결과를 메모리 대신 JSONL 파일에 기록하고,
+        파일에 이미 기록된 케이스는 다시 평가하지 않고 점수만 가져옵니다.
 
-        for i, test_case in enumerate(test_cases):
-            # DeepEval 테스트 케이스 형식으로 변환
-            llm_test_case = LLMTestCase(
-                input=test_case.input,
-                actual_output=test_case.actual_output,
-                expected_output=test_case.expected_output,
-                retrieval_context=test_case.context,
+        Args:
+            test_cases: RAGTestCase 객체 리스트
+            results_path: 개별 결과를 스트리밍할 JSONL 파일 경로 (None이면 메모리에 보관)
+
+        Returns:
+            점수와 통과/실패 상태를 포함하는 평가 결과 딕셔너리
+        """
+        # 이전 실행에서 기록된 케이스는 건너뛰고 나머지만 평가
+        stream = ResultsStream(results_path) if results_path else None
+        completed = stream.completed_results(test_cases) if stream else {}
+        pending = [i for i in range(len(test_cases)) if i not in completed]
+
+        # 비어 있는 케이스는 judge를 호출하지 않고 0점으로 처리
+        skipped = [i for i in pending if self.is_degenerate(test_cases[i])]
+        skipped_ids = set(skipped)
+        pending = [i for i in pending if i not in skipped_ids]
+
+        # 내용이 같은 케이스는 한 번만 채점하고 결과를 나눠 씀
+        unique_indices, case_positions = self.deduplicate([
+            (
+                test_cases[i].input,
+                test_cases[i].actual_output,
+                test_cases[i].expected_output,
+                tuple(test_cases[i].context),
             )
+            for i in pending
+        ])
 
-            # Faithfulness 평가
-            self.faithfulness_metric.measure(llm_test_case)
-            faithfulness_score = self.faithfulness_metric.score
+        # DeepEval 테스트 케이스 형식으로 변환
+        llm_test_cases = [
+            LLMTestCase(
+                input=test_cases[pending[j]].input,
+                actual_output=test_cases[pending[j]].actual_output,
+                expected_output=test_cases[pending[j]].expected_output,
+                retrieval_context=test_cases[pending[j]].context,
+            )
+            for j in unique_indices
+        ]
+
+        # 케이스 수를 알고 있으므로 결과 리스트를 미리 할당하고 인덱스로 채움
+        total_cases = len(test_cases)
+        results = {
+            "total_cases": total_cases,
+            "faithfulness_scores": [0.0] * total_cases,
+            "contextual_recall_scores": [0.0] * total_cases,
+            "answer_relevancy_scores": [0.0] * total_cases,
+        }
+        if stream is None:
+            results["individual_results"] = [None] * total_cases
+        else:
+            # 개별 결과는 파일에만 기록하고 메모리에는 점수만 유지
+            results["results_path"] = str(stream.path)
 
-            # Contextual Recall 평가
-            self.contextual_recall_metric.measure(llm_test_case)
-            contextual_recall_score = self.contextual_recall_metric.score
+        # 이전 실행에서 기록된 케이스는 점수만 가져옴
+        for i, individual_result in completed.items():
+            results["faithfulness_scores"][i] = individual_result["faithfulness"]["score"]
+            results["contextual_recall_scores"][i] = individual_result["contextual_recall"]["score"]
+            results["answer_relevancy_scores"][i] = individual_result["answer_relevancy"]["score"]
 
-            # Answer Relevancy 평가
-            self.answer_relevancy_metric.measure(llm_test_case)
-            answer_relevancy_score = self.answer_relevancy_metric.score
+        # 기록할 때마다 참조하는 임계값은 지역 변수로 둠
+        threshold = self.threshold
+
+        def record(i, scores):
+            """케이스 하나의 점수를 저장하고 개별 결과를 기록합니다."""
+            (
+                (faithfulness_score, faithfulness_reason),
+                (contextual_recall_score, contextual_recall_reason),
+                (answer_relevancy_score, answer_relevancy_reason),
+            ) = scores
+            test_case = test_cases[i]
 
             # 점수 저장
-            results["faithfulness_scores"].append(faithfulness_score)
-            results["contextual_recall_scores"].append(contextual_recall_score)
-            results["answer_relevancy_scores"].append(answer_relevancy_score)
+            results["faithfulness_scores"][i] = faithfulness_score
+            results["contextual_recall_scores"][i] = contextual_recall_score
+            results["answer_relevancy_scores"][i] = answer_relevancy_score
 
             # 개별 결과
             individual_result = {
@@ -94,42 +215,69 @@ class RAGEvaluator(BaseEvaluator):
                 "actual_output": test_case.actual_output,
                 "expected_output": test_case.expected_output,
                 "context": test_case.context,
-                "faithfulness": {
-                    "score": faithfulness_score,
-                    "passed": self.check_pass_threshold(faithfulness_score),
-                    "reason": self.faithfulness_metric.reason,
-                },
-                "contextual_recall": {
-                    "score": contextual_recall_score,
-                    "passed": self.check_pass_threshold(contextual_recall_score),
-                    "reason": self.contextual_recall_metric.reason,
-                },
-                "answer_relevancy": {
-                    "score": answer_relevancy_score,
-                    "passed": self.check_pass_threshold(answer_relevancy_score),
-                    "reason": self.answer_relevancy_metric.reason,
-                },
+                "faithfulness": MetricResult(
+                    faithfulness_score, faithfulness_score >= threshold, faithfulness_reason
+                ).to_dict(),
+                "contextual_recall": MetricResult(
+                    contextual_recall_score, contextual_recall_score >= threshold, contextual_recall_reason
+                ).to_dict(),
+                "answer_relevancy": MetricResult(
+                    answer_relevancy_score, answer_relevancy_score >= threshold, answer_relevancy_reason
+                ).to_dict(),
             }
-            results["individual_results"].append(individual_result)
+            if i in skipped_ids:
+                individual_result["skipped"] = True
+            if stream is None:
+                results["individual_results"][i] = individual_result
+            else:
+                stream.write(individual_result)
+
+        try:
+            skipped_result = (0.0, self.skipped_reason)
+            for i in skipped:
+                record(i, (skipped_result,) * 3)
+
+            # 모든 케이스 x 메트릭 조합을 동시에 평가 (통합 모드에서는 케이스마다 한 번)
+            semaphore = asyncio.Semaphore(self.max_concurrent)
+            if self.combined_metric is not None:
+                async def measure_case(j):
+                    return await self._a_measure_combined(llm_test_cases[j], semaphore)
+            else:
+                metrics = [
+                    self.faithfulness_metric,
+                    self.contextual_recall_metric,
+                    self.answer_relevancy_metric,
+                ]
 
-        # 평균 계산
-        results["average_faithfulness"] = self.calculate_average_score(
-            results["faithfulness_scores"]
+                async def measure_case(j):
+                    return await self.a_measure_case(metrics, llm_test_cases[j], semaphore)
+
+            await self.a_measure_unique_cases(pending, case_positions, measure_case, record)
+        finally:
+            if stream is not None:
+                stream.close()
+        results["skipped_cases"] = len(skipped)
+
+        # 평균 계산 (메트릭별 합계를 전체 평균에도 재사용)
+        faithfulness_sum = sum(results["faithfulness_scores"])
+        contextual_recall_sum = sum(results["contextual_recall_scores"])
+        answer_relevancy_sum = sum(results["answer_relevancy_scores"])
+        results["average_faithfulness"] = (
+            faithfulness_sum / total_cases if total_cases else 0.0
         )
-        results["average_contextual_recall"] = self.calculate_average_score(
-            results["contextual_recall_scores"]
+        results["average_contextual_recall"] = (
+            contextual_recall_sum / total_cases if total_cases else 0.0
         )
-        results["average_answer_relevancy"] = self.calculate_average_score(
-            results["answer_relevancy_scores"]
+        results["average_answer_relevancy"] = (
+            answer_relevancy_sum / total_cases if total_cases else 0.0
         )
 
         # 전체 평균
-        all_scores = (
-            results["faithfulness_scores"]
-            + results["contextual_recall_scores"]
-            + results["answer_relevancy_scores"]
+        results["overall_average"] = (
+            (faithfulness_sum + contextual_recall_sum + answer_relevancy_sum)
+            / (3 * total_cases)
+            if total_cases else 0.0
         )
-        results["overall_average"] = self.calculate_average_score(all_scores)
 
         # 통과/실패 판정
         results["passed"] = (
@@ -141,6 +289,40 @@ class RAGEvaluator(BaseEvaluator):
 
         return results
 
+    async def _a_measure_combined(
+        self,
+        llm_test_case: LLMTestCase,
+        semaphore: asyncio.Semaphore,
+    ) -> List[Tuple[float, str]]:
+        """
+        세 메트릭을 한 번의 judge 요청으로 함께 채점합니다.
+
+        캐시가 설정되어 있으면 통합 메트릭 키에 기준 이름을 붙인 키로 기준별 결과를 조회하고 저장합니다.
+        메트릭별 DeepEval 측정과는 키가 달라 두 모드의 점수가 섞이지 않습니다.
+
+        Args:
+            llm_test_case: DeepEval 테스트 케이스
+            semaphore: 동시 요청 수를 제한하는 세마포어
+
+        Returns:
+            RAG_CRITERIA 순서의 (점수, 이유) 튜플 리스트
+        """
+        keys = None
+        if self.cache:
+            combined_key = self.cache_key(self.combined_metric, llm_test_case)
+            keys = [JudgeCache.make_key([combined_key, name]) for name in RAG_CRITERIA]
+            cached = [self.cache.get(key) for key in keys]
+            if None not in cached:
+                return cached
+
+        async with semaphore:
+            scored = await self.combined_metric.a_measure(llm_test_case)
+
+        if keys:
+            for key, (score, reason) in zip(keys, scored):
+                self.cache.set(key, score, reason)
+        return scored
+
     def generate_report(self, results: Dict[str, Any]) -> str:
         """
         사람이 읽을 수 있는 평가 보고서를 생성합니다.
@@ -151,17 +333,7 @@ class RAGEvaluator(BaseEvaluator):
         Returns:
             포맷된 보고서 문자열
         """
-        report = []
-        report.append("=" * 60)
-        report.append("RAG SYSTEM EVALUATION REPORT")
-        report.append("=" * 60)
-        report.append(f"\nTotal Test Cases: {results['total_cases']}")
-        report.append(f"\nAverage Scores:")
-        report.append(f"  - Faithfulness: {results['average_faithfulness']:.3f}")
-        report.append(f"  - Contextual Recall: {results['average_contextual_recall']:.3f}")
-        report.append(f"  - Answer Relevancy: {results['average_answer_relevancy']:.3f}")
-        report.append(f"\nOverall Average: {results['overall_average']:.3f}")
-        report.append(f"Status: {'✅ PASSED' if results['passed'] else '❌ FAILED'}")
-        report.append("\n" + "=" * 60)
-
-        return "\n".join(report)
+        return _REPORT_TEMPLATE.format(
+            **results,
+            status="✅ PASSED" if results["passed"] else "❌ FAILED",
+        )
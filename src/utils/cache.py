@@ -0,0 +1,212 @@
+"""
+judge LLM 채점 결과를 위한 캐시
+같은 입력에 대한 재평가 시 API 호출 없이 이전 점수와 이유를 재사용합니다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+
+class JudgeCache:
+    """SQLite 파일에 (점수, 이유)를 저장하는 judge 응답 캐시"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: Optional[float] = None,
+        max_size: Optional[int] = None,
+    ):
+        """
+        캐시를 초기화합니다.
+
+        Args:
+            cache_dir: 캐시 파일을 저장할 디렉토리
+            ttl: 항목 유효 시간(초) (None이면 만료 없음)
+            max_size: 최대 항목 수 (None이면 제한 없음, 초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.cache_dir / "judge_cache.sqlite3",
+            check_same_thread=False,
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS judge_cache ("
+            "key TEXT PRIMARY KEY, score REAL, reason TEXT, "
+            "created_at REAL DEFAULT 0, accessed_at REAL DEFAULT 0)"
+        )
+        # 이전 버전에서 만든 캐시 파일에는 시간 컬럼이 없으므로 추가
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(judge_cache)")}
+        for column in ("created_at", "accessed_at"):
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE judge_cache ADD COLUMN {column} REAL DEFAULT 0"
+                )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS judge_cache_accessed_at "
+            "ON judge_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(parts: List[Any]) -> str:
+        """
+        캐시 키를 계산합니다.
+
+        Args:
+            parts: 키를 구성하는 값 리스트 (모델, 메트릭, 테스트 케이스 필드 등)
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[float, str]]:
+        """
+        캐시된 (점수, 이유)를 조회합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 (점수, 이유) 또는 없거나 만료되었으면 None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, reason, created_at FROM judge_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.ttl is not None and now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM judge_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            if self.max_size is not None:
+                self._conn.execute(
+                    "UPDATE judge_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+        return row[0], row[1]
+
+    def set(self, key: str, score: float, reason: Optional[str]) -> None:
+        """
+        (점수, 이유)를 캐시에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            score: 메트릭 점수
+            reason: 메트릭 평가 이유
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judge_cache "
+                "(key, score, reason, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, score, reason, now, now),
+            )
+            if self.max_size is not None:
+                # LRU: 가장 오래 사용하지 않은 항목부터 삭제
+                self._conn.execute(
+                    "DELETE FROM judge_cache WHERE key IN ("
+                    "SELECT key FROM judge_cache ORDER BY accessed_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_size,),
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """캐시 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """judge 모델 응답 텍스트를 프롬프트 해시로 저장하는 메모리 TTL LRU 캐시"""
+
+    def __init__(self, max_size: int = 2000, ttl: Optional[float] = 3600):
+        """
+        캐시를 초기화합니다.
+
+        Args:
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+            ttl: 항목 유효 시간(초) (None이면 만료 없음)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 키 -> (저장 시각, 응답 텍스트), 최근에 사용한 항목이 뒤쪽
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, schema: Optional[str] = None) -> str:
+        """
+        캐시 키를 계산합니다.
+
+        Args:
+            model: 모델 이름
+            prompt: 입력 프롬프트
+            schema: JSON 응답 모드의 스키마 이름 (일반 텍스트 응답이면 None)
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "schema": schema},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        캐시된 응답 텍스트를 조회합니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 응답 텍스트 또는 없거나 만료되었으면 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, text: str) -> None:
+        """
+        응답 텍스트를 캐시에 저장합니다.
+
+        Args:
+            key: 캐시 키
+            text: 모델 응답 텍스트
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,91 @@
+"""
+Gemini API 할당량(RPM/TPM)에 맞춰 요청 속도를 조절하는 토큰 버킷
+동시 요청이 한꺼번에 몰려 429 응답과 재시도가 발생하지 않도록 합니다.
+"""
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트의 토큰 수를 대략적으로 추정합니다 (4글자당 1토큰).
+
+    Args:
+        text: 프롬프트 문자열
+
+    Returns:
+        추정 토큰 수
+    """
+    return len(text) // 4
+
+
+class AsyncTokenBucket:
+    """분당 요청 수와 분당 토큰 수를 함께 제한하는 토큰 버킷"""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        토큰 버킷을 초기화합니다.
+
+        버킷 상태는 스레드 락으로 보호하므로 서로 다른 이벤트 루프(스레드)에서
+        실행되는 평가들이 하나의 버킷을 공유할 수 있습니다.
+
+        Args:
+            rpm: 분당 최대 요청 수 (None이면 제한 없음)
+            tpm: 분당 최대 토큰 수 (None이면 제한 없음)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm or 0)
+        self._tokens = float(tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        요청 하나와 지정한 토큰 수만큼 여유가 생길 때까지 비동기로 대기합니다.
+
+        Args:
+            tokens: 요청에 사용할 추정 토큰 수
+        """
+        while (delay := self._reserve(tokens)) > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, tokens: int = 0) -> None:
+        """
+        요청 하나와 지정한 토큰 수만큼 여유가 생길 때까지 블로킹으로 대기합니다.
+
+        Args:
+            tokens: 요청에 사용할 추정 토큰 수
+        """
+        while (delay := self._reserve(tokens)) > 0:
+            time.sleep(delay)
+
+    def _reserve(self, tokens: int) -> float:
+        """여유가 있으면 차감하고 0을, 없으면 다시 시도할 때까지의 대기 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+
+            # 한 번의 요청이 분당 한도를 넘으면 영원히 기다리지 않도록 한도로 자름
+            if self.tpm:
+                tokens = min(tokens, self.tpm)
+                self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+            if self.rpm:
+                self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+
+            delay = 0.0
+            if self.rpm and self._requests < 1:
+                delay = max(delay, (1 - self._requests) * 60 / self.rpm)
+            if self.tpm and self._tokens < tokens:
+                delay = max(delay, (tokens - self._tokens) * 60 / self.tpm)
+            if delay > 0:
+                return delay
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+            return 0.0
@@ -2,235 +2,284 @@
 평가 결과를 위한 보고서 생성 유틸리티
 """
 import json
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
+from .results_stream import load_results
 
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (speedups)
+    orjson = None
 
-class ReportGenerator:
-    """다양한 형식의 평가 보고서를 생성합니다."""
+# 보고서 파일 쓰기 버퍼 크기 (작은 write 호출이 많은 json.dump 경로에서 시스템 콜 감소)
+_WRITE_BUFFER_SIZE = 1 << 20
 
-    def __init__(self, output_dir: Path):
-        """
-        보고서 생성기를 초기화합니다.
+# HTML 이스케이프 변환 테이블 (str.translate로 한 번에 치환)
+_ESC = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
 
-        Args:
-            output_dir: 보고서를 저장할 디렉토리
-        """
-        self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def save_json_report(
-        self,
-        results: Dict[str, Any],
-        system_type: str,
-        filename: Optional[str] = None,
-    ) -> Path:
-        """
-        평가 결과를 JSON으로 저장합니다.
+@lru_cache(maxsize=4096)
+def _esc(text: str) -> str:
+    """
+    HTML 특수 문자를 이스케이프합니다.
 
-        Args:
-            results: 평가 결과 딕셔너리
-            system_type: 시스템 타입 (rag, agent, chatbot)
-            filename: 커스텀 파일명 (선택사항)
+    RAG 평가에서는 같은 검색 문서가 여러 케이스에 반복해서 나오므로 결과를 캐시합니다.
 
-        Returns:
-            저장된 파일 경로
-        """
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{system_type}_evaluation_{timestamp}.json"
+    Args:
+        text: 이스케이프할 문자열
 
-        output_path = self.output_dir / filename
+    Returns:
+        이스케이프된 문자열
+    """
+    return text.translate(_ESC)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
 
-        return output_path
+def input_preview(text: str, limit: int = 80) -> str:
+    """
+    보고서에 표시할 입력 미리보기를 만듭니다.
 
-    def save_html_report(
-        self,
-        results: Dict[str, Any],
-        system_type: str,
-        filename: Optional[str] = None,
-    ) -> Path:
-        """
-        평가 결과를 HTML로 저장합니다.
+    길이가 limit 이하이면 원문을 그대로 돌려주므로 짧은 입력은 새 문자열을 만들지 않습니다.
 
-        Args:
-            results: 평가 결과 딕셔너리
-            system_type: 시스템 타입 (rag, agent, chatbot)
-            filename: 커스텀 파일명 (선택사항)
+    Args:
+        text: 원본 입력 문자열
+        limit: 미리보기 최대 길이
 
-        Returns:
-            저장된 파일 경로
-        """
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{system_type}_evaluation_{timestamp}.html"
-
-        output_path = self.output_dir / filename
-
-        html_content = self._generate_html(results, system_type)
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+    Returns:
+        limit을 넘으면 잘라서 말줄임표를 붙인 문자열
+    """
+    return text if len(text) <= limit else text[:limit] + "…"
 
-        return output_path
 
-    def _generate_html(self, results: Dict[str, Any], system_type: str) -> str:
-        """
-        평가 결과를 위한 HTML 콘텐츠를 생성합니다.
+# 통과 여부별 (CSS 클래스, 색상, 아이콘)
+_STATUS = {
+    True: ("pass", "#28a745", "✅"),
+    False: ("fail", "#dc3545", "❌"),
+}
 
-        Args:
-            results: 평가 결과 딕셔너리
-            system_type: 시스템 타입 (rag, agent, chatbot)
+# 케이스 x 메트릭마다 반복되는 점수 포맷 (f-string 대신 % 포맷)
+_CELL_TMPL = '<td class="%s">%.3f</td>'
+_CELL_EMPTY_TMPL = '<td class="%s">-</td>'
 
-        Returns:
-            HTML 콘텐츠 문자열
+# 메트릭 평가 이유 블록 (상태 색상, 상태 색상, 아이콘, 메트릭 이름, 점수, 이유)
+_REASONS_OPEN = """
+            <div style="margin-top: 20px;">
+                <strong>평가 이유:</strong><br>
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        status_color = "#28a745" if results.get("passed", False) else "#dc3545"
-        status_text = "✅ 통과" if results.get("passed", False) else "❌ 실패"
-
-        # 시스템 타입에 따라 메트릭 행 생성
-        metric_rows = self._generate_metric_rows(results, system_type)
-
-        # 개별 테스트 케이스 행 생성
-        case_rows = self._generate_case_rows(results, system_type)
+_REASON_TMPL = """
+                <div style="background: #ffffff; border-left: 4px solid %s; padding: 12px; margin: 10px 0; border-radius: 4px;">
+                    <div style="font-weight: bold; color: %s; margin-bottom: 5px;">
+                        %s %s (Score: %.3f)
+                    </div>
+                    <div style="color: #555; font-size: 14px;">
+                        %s
+                    </div>
+                </div>
+                """
+_REASONS_CLOSE = "</div>"
 
-        html = f"""
+# Chatbot 독성 경고 섹션 (toxic 케이스 수, 케이스 목록)
+_CRITICAL_TMPL = """
+            <div class="critical">
+                <h3>🚨 치명적: Toxic 콘텐츠 발견</h3>
+                <p><strong>%d개의 toxic 응답이 발견되었습니다:</strong></p>
+                <ul>
+                    %s
+                </ul>
+            </div>
+            """
+_TOXIC_CASE_TMPL = "<li>테스트 케이스 %s: 점수 %.3f</li>"
+
+# 메트릭 결과가 없는 케이스의 기본값 (조회마다 빈 딕셔너리를 만들지 않도록 공유, 수정 금지)
+_EMPTY: Dict[str, Any] = {}
+
+# 시스템 타입별 개별 결과의 메트릭 키
+_METRIC_KEYS = {
+    "rag": ("faithfulness", "contextual_recall", "answer_relevancy"),
+    "agent": ("correctness", "answer_relevancy"),
+    "chatbot": ("toxicity", "answer_relevancy"),
+}
+
+# 메트릭 키별 표시 이름
+_METRIC_LABELS = {
+    "faithfulness": "Faithfulness",
+    "contextual_recall": "Contextual Recall",
+    "answer_relevancy": "Answer Relevancy",
+    "correctness": "Correctness",
+    "toxicity": "Toxicity",
+}
+
+# 시스템 타입별 개별 결과 테이블 헤더
+_HEADERS = {
+    system_type: "".join(f"<th>{_METRIC_LABELS[key]}</th>" for key in keys)
+    for system_type, keys in _METRIC_KEYS.items()
+}
+
+# 시스템 타입별 요약 카드의 (표시 이름, 결과 키) 목록
+_SUMMARY_METRICS = {
+    "rag": (
+        ("Faithfulness", "average_faithfulness"),
+        ("Contextual Recall", "average_contextual_recall"),
+        ("Answer Relevancy", "average_answer_relevancy"),
+        ("Overall Average", "overall_average"),
+    ),
+    "agent": (
+        ("Correctness", "average_correctness"),
+        ("Answer Relevancy", "average_answer_relevancy"),
+        ("Overall Average", "overall_average"),
+    ),
+    "chatbot": (
+        ("Toxicity", "average_toxicity"),
+        ("Answer Relevancy", "average_answer_relevancy"),
+        ("Toxic Cases", "toxic_cases"),
+    ),
+}
+
+# HTML 보고서의 고정 부분 (호출마다 큰 f-string을 다시 만들지 않도록 모듈 수준에 둠)
+_HTML_DOC_START_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{system_type.upper()} Evaluation Report</title>
-    <style>
-        body {{
+    <title>{title} Evaluation Report</title>
+"""
+
+# 모든 보고서에 공통인 스타일과 스크립트 (포맷하지 않으므로 중괄호를 그대로 씀)
+# 이 조각과 아래의 정적 조각은 파일에 그대로 쓰므로 import 시 한 번만 UTF-8로 인코딩해 둠
+_STATIC_HEAD = """    <style>
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             max-width: 1200px;
             margin: 0 auto;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             background: white;
             border-radius: 8px;
             padding: 30px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             border-bottom: 3px solid #007bff;
             padding-bottom: 10px;
-        }}
-        .metadata {{
+        }
+        .metadata {
             color: #666;
             font-size: 14px;
             margin-bottom: 30px;
-        }}
-        .status {{
+        }
+        .status {
             font-size: 24px;
             font-weight: bold;
-            color: {status_color};
             margin: 20px 0;
-        }}
-        .metrics {{
+        }
+        .metrics {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .metric-card {{
+        }
+        .metric-card {
             background: #f8f9fa;
             border-left: 4px solid #007bff;
             padding: 15px;
             border-radius: 4px;
-        }}
-        .metric-name {{
+        }
+        .metric-name {
             color: #666;
             font-size: 14px;
             margin-bottom: 5px;
-        }}
-        .metric-value {{
+        }
+        .metric-value {
             font-size: 28px;
             font-weight: bold;
             color: #333;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 30px;
-        }}
-        th, td {{
+        }
+        th, td {
             text-align: left;
             padding: 12px;
             border-bottom: 1px solid #ddd;
-        }}
-        th {{
+        }
+        th {
             background-color: #007bff;
             color: white;
             font-weight: 600;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background-color: #f8f9fa;
-        }}
-        .pass {{
+        }
+        .pass {
             color: #28a745;
             font-weight: bold;
-        }}
-        .fail {{
+        }
+        .fail {
             color: #dc3545;
             font-weight: bold;
-        }}
-        .warning {{
+        }
+        .warning {
             background-color: #fff3cd;
             border-left: 4px solid #ffc107;
             padding: 15px;
             margin: 20px 0;
             border-radius: 4px;
-        }}
-        .critical {{
+        }
+        .critical {
             background-color: #f8d7da;
             border-left: 4px solid #dc3545;
             padding: 15px;
             margin: 20px 0;
             border-radius: 4px;
-        }}
-        .case-row:hover {{
+        }
+        .case-row:hover {
             background-color: #e3f2fd !important;
-        }}
-        .detail-row td {{
+        }
+        .detail-row td {
             border: none;
-        }}
+        }
     </style>
     <script>
-        function toggleDetail(detailId) {{
+        function toggleDetail(detailId) {
             const detailRow = document.getElementById(detailId);
-            if (detailRow.style.display === 'none') {{
+            if (detailRow.style.display === 'none') {
                 detailRow.style.display = 'table-row';
-            }} else {{
+            } else {
                 detailRow.style.display = 'none';
-            }}
-        }}
+            }
+        }
     </script>
+""".encode("utf-8")
+
+# 통과 여부에 따라 달라지는 상태 색상만 별도 스타일로 지정
+_HTML_BANNER_TEMPLATE = """    <style>.status {{ color: {status_color}; }}</style>
 </head>
 <body>
     <div class="container">
-        <h1>{system_type.upper()} System Evaluation Report</h1>
+        <h1>{title} System Evaluation Report</h1>
         <div class="metadata">
             <p>Generated: {timestamp}</p>
-            <p>Total Test Cases: {results.get('total_cases', 0)}</p>
+            <p>Total Test Cases: {total_cases}</p>
         </div>
 
         <div class="status">{status_text}</div>
 
         <div class="metrics">
-            {metric_rows}
+            """
+
+_HTML_METRICS_END = """
         </div>
 
-        {self._generate_warnings(results, system_type)}
+        """.encode("utf-8")
+
+_HTML_TABLE_START = """
 
         <h2>Individual Test Case Results</h2>
         <table>
@@ -238,46 +287,212 @@ class ReportGenerator:
                 <tr>
                     <th>Test ID</th>
                     <th>Input</th>
-                    {self._get_metric_headers(system_type)}
+                    """.encode("utf-8")
+
+_HTML_TABLE_HEAD_END = """
                 </tr>
             </thead>
             <tbody>
-                {case_rows}
+                """.encode("utf-8")
+
+# 개별 테스트 케이스 행 조각 (케이스마다 f-string을 새로 만들지 않고 이어 붙임)
+_ROW_OPEN = """
+                <tr class="case-row" onclick="toggleDetail('detail-"""
+_ROW_MID = """')" style="cursor: pointer;">
+                    <td>"""
+_ROW_INPUT = """</td>
+                    <td>"""
+_ROW_SUFFIX = """ <span style="color: #007bff;">▼</span></td>
+                    """
+_ROW_CLOSE = """
+                </tr>
+                """
+_ROW_END = "\n            \n"
+
+_HTML_EPILOGUE = """
             </tbody>
         </table>
     </div>
 </body>
 </html>
-"""
-        return html
+""".encode("utf-8")
+
+
+class ReportGenerator:
+    """다양한 형식의 평가 보고서를 생성합니다."""
+
+    def __init__(self, output_dir: Path):
+        """
+        보고서 생성기를 초기화합니다.
+
+        Args:
+            output_dir: 보고서를 저장할 디렉토리
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def save_json_report(
+        self,
+        results: Dict[str, Any],
+        system_type: str,
+        filename: Optional[str] = None,
+        indent: Optional[int] = None,
+    ) -> Path:
+        """
+        평가 결과를 JSON으로 저장합니다.
+
+        기본적으로 공백 없는 JSON으로 저장하며, 사람이 읽을 보고서는 indent를 지정합니다.
+
+        Args:
+            results: 평가 결과 딕셔너리
+            system_type: 시스템 타입 (rag, agent, chatbot)
+            filename: 커스텀 파일명 (선택사항)
+            indent: 들여쓰기 칸 수 (None이면 한 줄로 저장, 0 이상이면 줄바꿈하며 orjson 사용 시 항상 2칸)
+
+        Returns:
+            저장된 파일 경로
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{system_type}_evaluation_{timestamp}.json"
+
+        output_path = self.output_dir / filename
+
+        if orjson is not None:
+            # json.dump처럼 문자열이 아닌 키도 허용
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if indent is not None:
+                options |= orjson.OPT_INDENT_2
+            with open(output_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(orjson.dumps(results, option=options))
+            return output_path
+
+        with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            # 평가 결과는 순환 참조가 없는 트리 구조이므로 순환 검사를 생략
+            json.dump(
+                results,
+                f,
+                indent=indent,
+                ensure_ascii=False,
+                check_circular=False,
+                separators=(",", ":") if indent is None else (",", ": "),
+            )
+
+        return output_path
+
+    def save_html_report(
+        self,
+        results: Dict[str, Any],
+        system_type: str,
+        filename: Optional[str] = None,
+        generated_at: Optional[str] = None,
+    ) -> Path:
+        """
+        평가 결과를 HTML로 저장합니다.
+
+        Args:
+            results: 평가 결과 딕셔너리
+            system_type: 시스템 타입 (rag, agent, chatbot)
+            filename: 커스텀 파일명 (선택사항)
+            generated_at: 보고서에 표시할 생성 시각 (None이면 현재 시각)
+
+        Returns:
+            저장된 파일 경로
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{system_type}_evaluation_{timestamp}.html"
+
+        output_path = self.output_dir / filename
+
+        # 문서 전체를 문자열로 만들지 않고 인코딩된 조각을 파일에 바로 기록
+        with open(output_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            self._write_html(f.write, results, system_type, generated_at)
+
+        return output_path
+
+    def save_all(self, results: Dict[str, Any], system_type: str) -> List[Path]:
+        """
+        평가 결과를 JSON과 HTML로 함께 저장합니다.
+
+        두 보고서가 같은 시각을 파일명과 생성 시각으로 사용하도록 현재 시각을 한 번만 구합니다.
+
+        Args:
+            results: 평가 결과 딕셔너리
+            system_type: 시스템 타입 (rag, agent, chatbot)
+
+        Returns:
+            저장된 [JSON, HTML] 파일 경로
+        """
+        now = datetime.now()
+        stamp = now.strftime("%Y%m%d_%H%M%S")
+        generated_at = now.strftime("%Y-%m-%d %H:%M:%S")
+        return [
+            self.save_json_report(results, system_type, f"{system_type}_evaluation_{stamp}.json"),
+            self.save_html_report(
+                results, system_type, f"{system_type}_evaluation_{stamp}.html", generated_at
+            ),
+        ]
+
+    def _write_html(
+        self,
+        write: Callable[[bytes], Any],
+        results: Dict[str, Any],
+        system_type: str,
+        generated_at: Optional[str] = None,
+    ) -> None:
+        """
+        평가 결과를 위한 HTML 콘텐츠를 조각 단위로 기록합니다.
+
+        전체 문서를 하나의 문자열로 만들지 않고 생성되는 순서대로 write에 넘기므로,
+        파일의 write를 넘기면 케이스 수와 관계없이 메모리 사용량이 일정합니다.
+
+        Args:
+            write: UTF-8로 인코딩된 HTML 조각을 받을 함수 (예: 바이너리 파일 객체의 write)
+            results: 평가 결과 딕셔너리
+            system_type: 시스템 타입 (rag, agent, chatbot)
+            generated_at: 보고서에 표시할 생성 시각 (None이면 현재 시각)
+        """
+        timestamp = generated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        status_color = "#28a745" if results.get("passed", False) else "#dc3545"
+        status_text = "✅ 통과" if results.get("passed", False) else "❌ 실패"
+
+        title = system_type.upper()
+        write(_HTML_DOC_START_TEMPLATE.format(title=title).encode("utf-8"))
+        write(_STATIC_HEAD)
+        write(_HTML_BANNER_TEMPLATE.format(
+            status_color=status_color,
+            title=title,
+            timestamp=timestamp,
+            total_cases=results.get("total_cases", 0),
+            status_text=status_text,
+        ).encode("utf-8"))
+
+        # 시스템 타입에 따라 메트릭 행 생성
+        write(self._generate_metric_rows(results, system_type).encode("utf-8"))
+        write(_HTML_METRICS_END)
+        write(self._generate_warnings(results, system_type).encode("utf-8"))
+        write(_HTML_TABLE_START)
+        write(self._get_metric_headers(system_type).encode("utf-8"))
+        write(_HTML_TABLE_HEAD_END)
+
+        # 개별 테스트 케이스 행 생성
+        self._write_case_rows(write, results, system_type)
+        write(_HTML_EPILOGUE)
 
     def _generate_metric_rows(self, results: Dict[str, Any], system_type: str) -> str:
         """메트릭 카드를 위한 HTML을 생성합니다."""
         rows = []
 
-        if system_type == "rag":
-            metrics = [
-                ("Faithfulness", results.get("average_faithfulness", 0)),
-                ("Contextual Recall", results.get("average_contextual_recall", 0)),
-                ("Answer Relevancy", results.get("average_answer_relevancy", 0)),
-                ("Overall Average", results.get("overall_average", 0)),
-            ]
-        elif system_type == "agent":
-            metrics = [
-                ("Correctness", results.get("average_correctness", 0)),
-                ("Answer Relevancy", results.get("average_answer_relevancy", 0)),
-                ("Overall Average", results.get("overall_average", 0)),
-            ]
-        elif system_type == "chatbot":
-            metrics = [
-                ("Toxicity", results.get("average_toxicity", 0)),
-                ("Answer Relevancy", results.get("average_answer_relevancy", 0)),
-                ("Toxic Cases", len(results.get("toxic_cases", []))),
-            ]
-        else:
-            metrics = []
+        for name, key in _SUMMARY_METRICS.get(system_type, ()):
+            value = results.get(key, 0)
+            if value is None:
+                # 측정하지 않은 메트릭(예: fail_fast 조기 종료)은 카드를 표시하지 않음
+                continue
+            if isinstance(value, list):
+                # 케이스 목록은 개수로 표시
+                value = len(value)
 
-        for name, value in metrics:
             if isinstance(value, float):
                 value_str = f"{value:.3f}"
             else:
@@ -292,40 +507,54 @@ class ReportGenerator:
 
         return "\n".join(rows)
 
-    def _generate_case_rows(self, results: Dict[str, Any], system_type: str) -> str:
-        """개별 테스트 케이스를 위한 HTML 테이블 행을 생성합니다."""
-        rows = []
-
-        for case in results.get("individual_results", []):
+    def _write_case_rows(
+        self,
+        write: Callable[[bytes], Any],
+        results: Dict[str, Any],
+        system_type: str,
+    ) -> None:
+        """개별 테스트 케이스를 위한 HTML 테이블 행을 케이스마다 한 번씩 인코딩해 기록합니다."""
+        individual_results = results.get("individual_results")
+        if individual_results is None and "results_path" in results:
+            # 개별 결과를 JSONL로 스트리밍한 경우 파일에서 읽음
+            individual_results = load_results(Path(results["results_path"]))
+
+        for case in individual_results or []:
             test_id = case.get("test_case_id", "")
-            input_text = case.get("input", "")[:80] + "..." if len(case.get("input", "")) > 80 else case.get("input", "")
-
-            # 시스템 타입에 따라 메트릭 셀 생성
-            metric_cells = self._get_metric_cells(case, system_type)
-
-            # 전체 정보를 포함하는 상세 행 생성
-            detail_row = self._generate_detail_row(case, system_type, test_id)
-
-            rows.append(f"""
-                <tr class="case-row" onclick="toggleDetail('detail-{test_id}')" style="cursor: pointer;">
-                    <td>{test_id}</td>
-                    <td>{input_text} <span style="color: #007bff;">▼</span></td>
-                    {metric_cells}
-                </tr>
-                {detail_row}
-            """)
-
-        return "\n".join(rows)
+            tid = str(test_id)
+            input_text = input_preview(case.get("input", ""))
+
+            parts = [
+                _ROW_OPEN, tid, _ROW_MID, tid, _ROW_INPUT, input_text, _ROW_SUFFIX,
+                # 시스템 타입에 따라 메트릭 셀 생성
+                self._get_metric_cells(case, system_type),
+                _ROW_CLOSE,
+            ]
+            # 전체 정보를 포함하는 상세 행 추가
+            self._write_detail_row(parts.append, case, system_type, test_id)
+            parts.append(_ROW_END)
+            write("".join(parts).encode("utf-8"))
 
-    def _generate_detail_row(self, case: Dict[str, Any], system_type: str, test_id: str) -> str:
-        """테스트 케이스를 위한 확장 가능한 상세 행을 생성합니다."""
+    def _write_detail_row(
+        self,
+        write: Callable[[str], Any],
+        case: Dict[str, Any],
+        system_type: str,
+        test_id: str,
+    ) -> None:
+        """테스트 케이스를 위한 확장 가능한 상세 행을 기록합니다."""
         input_full = case.get("input", "").replace("\n", "<br>")
         actual_output = case.get("actual_output", "").replace("\n", "<br>")
         expected_output = case.get("expected_output", "")
         context = case.get("context", [])
 
+        write(f"""
+        <tr id="detail-{test_id}" class="detail-row" style="display: none;">
+            <td colspan="10" style="background: #f0f0f0; padding: 20px;">
+                """)
+
         # 시스템 타입에 따라 상세 콘텐츠 구성
-        detail_content = f"""
+        write(f"""
             <div style="margin-bottom: 15px;">
                 <strong>입력:</strong><br>
                 <div style="background: #f8f9fa; padding: 10px; border-radius: 4px; margin-top: 5px;">
@@ -338,132 +567,92 @@ class ReportGenerator:
                     {actual_output}
                 </div>
             </div>
-        """
+        """)
 
         if expected_output:
             expected_output = expected_output.replace("\n", "<br>")
-            detail_content += f"""
+            write(f"""
             <div style="margin-bottom: 15px;">
                 <strong>예상 출력:</strong><br>
                 <div style="background: #fff3cd; padding: 10px; border-radius: 4px; margin-top: 5px;">
                     {expected_output}
                 </div>
             </div>
-            """
+            """)
 
         if context and system_type == "rag":
-            context_html = "<br><br>".join([f"<li>{ctx.replace('<', '&lt;').replace('>', '&gt;')}</li>" for ctx in context])
-            detail_content += f"""
+            context_html = "<br><br>".join([f"<li>{_esc(ctx)}</li>" for ctx in context])
+            write(f"""
             <div style="margin-bottom: 15px;">
                 <strong>컨텍스트 (검색된 문서):</strong><br>
                 <ul style="background: #e7f3ff; padding: 15px 15px 15px 35px; border-radius: 4px; margin-top: 5px;">
                     {context_html}
                 </ul>
             </div>
-            """
+            """)
 
         # 메트릭 이유 추가
-        detail_content += self._generate_metric_reasons(case, system_type)
+        self._write_metric_reasons(write, case, system_type)
 
-        return f"""
-        <tr id="detail-{test_id}" class="detail-row" style="display: none;">
-            <td colspan="10" style="background: #f0f0f0; padding: 20px;">
-                {detail_content}
+        write("""
             </td>
         </tr>
-        """
+        """)
 
-    def _generate_metric_reasons(self, case: Dict[str, Any], system_type: str) -> str:
-        """메트릭 평가 이유를 위한 HTML을 생성합니다."""
-        reasons_html = """
-            <div style="margin-top: 20px;">
-                <strong>평가 이유:</strong><br>
-        """
-
-        metrics = []
-        if system_type == "rag":
-            metrics = ["faithfulness", "contextual_recall", "answer_relevancy"]
-        elif system_type == "agent":
-            metrics = ["correctness", "answer_relevancy"]
-        elif system_type == "chatbot":
-            metrics = ["toxicity", "answer_relevancy"]
+    def _write_metric_reasons(
+        self,
+        write: Callable[[str], Any],
+        case: Dict[str, Any],
+        system_type: str,
+    ) -> None:
+        """메트릭 평가 이유를 위한 HTML을 기록합니다."""
+        write(_REASONS_OPEN)
 
-        for metric in metrics:
-            metric_data = case.get(metric, {})
+        for metric in _METRIC_KEYS.get(system_type, ()):
+            metric_data = case.get(metric, _EMPTY)
             reason = metric_data.get("reason", "")
             score = metric_data.get("score", 0)
             passed = metric_data.get("passed", False)
 
             if reason:
-                metric_name = metric.replace("_", " ").title()
-                status_color = "#28a745" if passed else "#dc3545"
-                status_icon = "✅" if passed else "❌"
-
-                reasons_html += f"""
-                <div style="background: #ffffff; border-left: 4px solid {status_color}; padding: 12px; margin: 10px 0; border-radius: 4px;">
-                    <div style="font-weight: bold; color: {status_color}; margin-bottom: 5px;">
-                        {status_icon} {metric_name} (Score: {score:.3f})
-                    </div>
-                    <div style="color: #555; font-size: 14px;">
-                        {reason.replace('<', '&lt;').replace('>', '&gt;')}
-                    </div>
-                </div>
-                """
+                metric_name = _METRIC_LABELS[metric]
+                _, status_color, status_icon = _STATUS[bool(passed)]
+                write(_REASON_TMPL % (
+                    status_color, status_color, status_icon, metric_name, score, _esc(reason)
+                ))
 
-        reasons_html += "</div>"
-        return reasons_html
+        write(_REASONS_CLOSE)
 
     def _get_metric_headers(self, system_type: str) -> str:
         """메트릭을 위한 테이블 헤더를 가져옵니다."""
-        if system_type == "rag":
-            return "<th>Faithfulness</th><th>Contextual Recall</th><th>Answer Relevancy</th>"
-        elif system_type == "agent":
-            return "<th>Correctness</th><th>Answer Relevancy</th>"
-        elif system_type == "chatbot":
-            return "<th>Toxicity</th><th>Answer Relevancy</th>"
-        return ""
+        return _HEADERS.get(system_type, "")
 
     def _get_metric_cells(self, case: Dict[str, Any], system_type: str) -> str:
         """메트릭을 위한 테이블 셀을 가져옵니다."""
         cells = []
 
-        if system_type == "rag":
-            for metric in ["faithfulness", "contextual_recall", "answer_relevancy"]:
-                score = case.get(metric, {}).get("score", 0)
-                passed = case.get(metric, {}).get("passed", False)
-                css_class = "pass" if passed else "fail"
-                cells.append(f'<td class="{css_class}">{score:.3f}</td>')
-
-        elif system_type == "agent":
-            for metric in ["correctness", "answer_relevancy"]:
-                score = case.get(metric, {}).get("score", 0)
-                passed = case.get(metric, {}).get("passed", False)
-                css_class = "pass" if passed else "fail"
-                cells.append(f'<td class="{css_class}">{score:.3f}</td>')
-
-        elif system_type == "chatbot":
-            for metric in ["toxicity", "answer_relevancy"]:
-                score = case.get(metric, {}).get("score", 0)
-                passed = case.get(metric, {}).get("passed", False)
-                css_class = "pass" if passed else "fail"
-                cells.append(f'<td class="{css_class}">{score:.3f}</td>')
+        for metric in _METRIC_KEYS.get(system_type, ()):
+            metric_data = case.get(metric, _EMPTY)
+            score = metric_data.get("score", 0)
+            css_class = _STATUS[bool(metric_data.get("passed", False))][0]
+            # Chatbot fail_fast로 조기 종료되면 측정하지 않은 점수는 None
+            if score is None:
+                cells.append(_CELL_EMPTY_TMPL % css_class)
+            else:
+                cells.append(_CELL_TMPL % (css_class, score))
 
         return "".join(cells)
 
     def _generate_warnings(self, results: Dict[str, Any], system_type: str) -> str:
         """경고/오류 섹션을 생성합니다."""
-        warnings = []
-
-        if system_type == "chatbot" and results.get("critical_failure", False):
-            toxic_cases = results.get("toxic_cases", [])
-            warnings.append(f"""
-            <div class="critical">
-                <h3>🚨 치명적: Toxic 콘텐츠 발견</h3>
-                <p><strong>{len(toxic_cases)}개의 toxic 응답이 발견되었습니다:</strong></p>
-                <ul>
-                    {''.join([f'<li>테스트 케이스 {c["test_case_id"]}: 점수 {c["toxicity_score"]:.3f}</li>' for c in toxic_cases])}
-                </ul>
-            </div>
-            """)
-
-        return "\n".join(warnings)
+        # 경고는 독성이 발견된 Chatbot 보고서에만 있음
+        if system_type != "chatbot" or not results.get("critical_failure", False):
+            return ""
+
+        toxic_cases = results.get("toxic_cases", [])
+        return _CRITICAL_TMPL % (
+            len(toxic_cases),
+            "".join([
+                _TOXIC_CASE_TMPL % (c["test_case_id"], c["toxicity_score"]) for c in toxic_cases
+            ]),
+        )
@@ -0,0 +1,197 @@
+"""
+개별 평가 결과를 JSONL 파일로 스트리밍하는 유틸리티
+대규모 평가에서 개별 결과를 메모리에 모두 들고 있지 않도록 하고,
+같은 파일로 다시 실행하면 이미 기록된 케이스를 건너뛰고 이어서 평가합니다.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성 (speedups)
+    orjson = None
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    """결과 레코드를 개행 없는 JSON 바이트로 직렬화합니다."""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(line: bytes) -> Dict[str, Any]:
+    """JSON 한 줄을 결과 레코드로 역직렬화합니다."""
+    if orjson is not None:
+        # orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스입니다
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def case_key(test_case: Any) -> str:
+    """
+    테스트 케이스의 전체 내용으로 재개용 키를 계산합니다.
+
+    입력과 출력뿐 아니라 예상 출력, 컨텍스트 등 점수에 영향을 주는 모든 필드를 포함하므로
+    케이스 내용이 하나라도 바뀌면 이전 결과를 재사용하지 않습니다.
+
+    Args:
+        test_case: Pydantic 테스트 케이스 객체
+
+    Returns:
+        SHA-256 16진수 문자열
+    """
+    data = test_case.model_dump() if hasattr(test_case, "model_dump") else vars(test_case)
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_results(path: Path) -> List[Dict[str, Any]]:
+    """
+    JSONL 파일에 기록된 개별 결과를 test_case_id 순서로 읽습니다.
+
+    같은 케이스가 여러 번 기록되어 있으면 마지막 결과를 사용합니다.
+
+    Args:
+        path: 결과 JSONL 파일 경로
+
+    Returns:
+        개별 결과 딕셔너리 리스트
+    """
+    completed = ResultsStream(path).completed
+    return [completed[i] for i in sorted(completed)]
+
+
+class ResultsStream:
+    """개별 평가 결과를 JSONL 파일에 하나씩 기록하는 스트림"""
+
+    def __init__(self, path: Path):
+        """
+        결과 스트림을 초기화합니다.
+
+        파일이 이미 있으면 기록된 결과를 읽어 두었다가 completed_results로 제공하고,
+        새 결과는 파일 끝에 이어서 기록합니다. 닫을 때 더 이상 유효하지 않거나
+        중복된 레코드가 남아 있으면 케이스마다 최신 결과 하나만 남도록 파일을 다시 씁니다.
+
+        Args:
+            path: 결과 JSONL 파일 경로
+        """
+        self.path = Path(path)
+        self.completed: Dict[int, Dict[str, Any]] = {}
+        self._valid_size = 0
+        self._line_count = 0
+        self._file = None
+        # 재개할 때 유지할 레코드의 test_case_id (completed_results가 현재 케이스 기준으로 좁힘)
+        self._keep_ids: Set[int] = set()
+        self._written_ids: Set[int] = set()
+        self._case_keys: Optional[List[str]] = None
+
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                for line in f:
+                    # 중단된 실행이 남긴 마지막 불완전한 줄은 버림
+                    if not line.endswith(b"\n"):
+                        break
+                    record = _loads(line)
+                    self.completed[record["test_case_id"]] = record
+                    self._valid_size += len(line)
+                    self._line_count += 1
+            self._keep_ids = set(self.completed)
+
+    def completed_results(self, test_cases: List[Any]) -> Dict[int, Dict[str, Any]]:
+        """
+        이전 실행에서 이미 기록된 케이스 중 현재 테스트 케이스와 내용이 같은 결과를 반환합니다.
+
+        케이스 내용은 case_key로 비교하며, 이후 write로 기록하는 결과에도 같은 키를 저장합니다.
+
+        Args:
+            test_cases: 테스트 케이스 객체 리스트
+
+        Returns:
+            test_case_id별 개별 결과 딕셔너리
+        """
+        self._case_keys = [case_key(test_case) for test_case in test_cases]
+        matched = {
+            i: record
+            for i, record in self.completed.items()
+            if i < len(test_cases) and record.get("case_key") == self._case_keys[i]
+        }
+        self._keep_ids = set(matched)
+        return matched
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        개별 결과 하나를 파일 끝에 기록합니다.
+
+        Args:
+            record: test_case_id를 포함하는 개별 결과 딕셔너리
+        """
+        if self._file is None:
+            self._open()
+        i = record["test_case_id"]
+        if self._case_keys is not None and i < len(self._case_keys):
+            record = {**record, "case_key": self._case_keys[i]}
+        self._file.write(_dumps(record) + b"\n")
+        # 실행이 중단되어도 이미 끝난 케이스가 파일에 남도록 레코드마다 내보냄
+        self._file.flush()
+        self._line_count += 1
+        self._written_ids.add(i)
+
+    def discard(self, ids: Iterable[int]) -> None:
+        """
+        케이스의 결과를 버립니다. 이미 기록된 레코드는 닫을 때 파일에서 제거됩니다.
+
+        Args:
+            ids: 버릴 결과의 test_case_id
+        """
+        ids = set(ids)
+        self._keep_ids -= ids
+        self._written_ids -= ids
+
+    def _open(self) -> None:
+        """쓰기용으로 파일을 열고, 중단된 실행이 남긴 불완전한 마지막 줄을 잘라냅니다."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        if self._file.tell() != self._valid_size:
+            self._file.truncate(self._valid_size)
+
+    def close(self) -> None:
+        """버퍼를 비우고 파일을 닫은 뒤, 오래되거나 중복된 레코드가 있으면 파일을 정리합니다."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        live_ids = self._keep_ids | self._written_ids
+        if self._line_count != len(live_ids):
+            self._compact(live_ids)
+
+    def _compact(self, live_ids: Set[int]) -> None:
+        """
+        유효한 케이스마다 마지막으로 기록된 레코드 하나만 남기고 파일을 다시 씁니다.
+
+        Args:
+            live_ids: 남길 레코드의 test_case_id 집합
+        """
+        latest: Dict[int, bytes] = {}
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                i = _loads(line)["test_case_id"]
+                if i in live_ids:
+                    latest[i] = line
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for i in sorted(latest):
+                f.write(latest[i])
+        os.replace(tmp_path, self.path)
+        self._valid_size = sum(len(line) for line in latest.values())
+        self._line_count = len(latest)
+
+    def __enter__(self) -> "ResultsStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
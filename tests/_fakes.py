@@ -0,0 +1,49 @@
+"""
+Stand-in judge model and metrics for running the evaluators offline.
+"""
+from deepeval.models import DeepEvalBaseLLM
+
+
+class FakeJudge(DeepEvalBaseLLM):
+    """Judge model that is never called; the fake metrics score cases themselves."""
+
+    def __init__(self):
+        self.model_name = "fake-judge"
+
+    def load_model(self):
+        return None
+
+    def generate(self, prompt, schema=None):
+        raise AssertionError("the fake metrics never call the judge")
+
+    async def a_generate(self, prompt, schema=None):
+        raise AssertionError("the fake metrics never call the judge")
+
+    def get_model_name(self):
+        return self.model_name
+
+
+class FakeMetric:
+    """
+    Metric that scores each case from a table keyed by input.
+
+    Inputs missing from the table score `default`. Inputs in `fail_on` raise, as a judge
+    outage would. Every measured input is appended to `calls`, which copies share.
+    """
+
+    async_mode = True
+
+    def __init__(self, name, scores=None, default=0.9, fail_on=()):
+        self.name = name
+        self.scores = scores or {}
+        self.default = default
+        self.fail_on = set(fail_on)
+        self.calls = []
+
+    async def a_measure(self, test_case, _show_indicator=True):
+        self.calls.append(test_case.input)
+        if test_case.input in self.fail_on:
+            raise RuntimeError(f"{self.name} judge unavailable")
+        self.score = self.scores.get(test_case.input, self.default)
+        self.reason = f"{self.name} reason"
+        return self.score
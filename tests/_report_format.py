@@ -0,0 +1,13 @@
+"""
+Per-case report line formatting shared by the system test suites.
+"""
+from src.evaluators.base import MetricResult
+
+# Per-case report line template and pass/fail badges, built once at import
+_METRIC_LINE = "  {}: {:.3f} - {}"
+_BADGE = {True: "✅ PASS", False: "❌ FAIL"}
+
+
+def metric_line(name: str, metric: MetricResult) -> str:
+    """Format one metric result as a report line, e.g. "  Toxicity: 0.120 - ✅ PASS"."""
+    return _METRIC_LINE.format(name, metric.score, _BADGE[metric.passed])
@@ -0,0 +1,159 @@
+"""
+Shared pytest fixtures for the evaluation test suites.
+"""
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.config.settings import settings
+from src.data.loader import DatasetLoader
+from src.evaluators.base import GeminiModel
+from src.utils.cache import ResponseCache
+from src.utils.rate_limiter import AsyncTokenBucket
+from src.utils.report import ReportGenerator
+
+# Judge response cache [hits, misses] of this process, or of all xdist workers
+# on the controller; None until the gemini_model fixture has been torn down
+_response_cache_stats = None
+
+
+def pytest_configure(config):
+    """Register the custom markers used by the test suites."""
+    config.addinivalue_line(
+        "markers", "report: prints per-case results without extra assertions"
+    )
+
+
+@pytest.fixture(scope="session")
+def gemini_model():
+    """Create Gemini model instance."""
+    settings.validate_api_key()
+    rate_limiter = (
+        AsyncTokenBucket(rpm=settings.gemini_rpm or None, tpm=settings.gemini_tpm or None)
+        if settings.gemini_rpm or settings.gemini_tpm
+        else None
+    )
+    # Judge prompts repeated within the session are answered from memory
+    response_cache = ResponseCache(max_size=2000, ttl=3600)
+    yield GeminiModel(
+        model=settings.gemini_model,
+        api_key=settings.gemini_api_key,
+        rate_limiter=rate_limiter,
+        response_cache=response_cache,
+    )
+    _add_response_cache_stats([response_cache.hits, response_cache.misses])
+
+
+def _add_response_cache_stats(stats):
+    global _response_cache_stats
+    if _response_cache_stats is None:
+        _response_cache_stats = [0, 0]
+    _response_cache_stats[0] += stats[0]
+    _response_cache_stats[1] += stats[1]
+
+
+def pytest_sessionfinish(session):
+    """On an xdist worker, hand the response cache counts to the controller."""
+    workeroutput = getattr(session.config, "workeroutput", None)
+    if workeroutput is not None and _response_cache_stats is not None:
+        workeroutput["response_cache_stats"] = _response_cache_stats
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """On the xdist controller, add up the counts reported by each worker."""
+    stats = getattr(node, "workeroutput", {}).get("response_cache_stats")
+    if stats is not None:
+        _add_response_cache_stats(stats)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print the judge response cache counts at the end of the run."""
+    if _response_cache_stats is not None:
+        hits, misses = _response_cache_stats
+        terminalreporter.write_line(f"Judge response cache: {hits} hits, {misses} misses")
+
+
+@pytest.fixture(scope="session")
+def dataset_loader():
+    """Create dataset loader instance."""
+    return DatasetLoader(settings.datasets_dir)
+
+
+@pytest.fixture(scope="session")
+def datasets(dataset_loader):
+    """Load the RAG, Agent and Chatbot datasets concurrently, keyed by system type."""
+    loaders = {
+        "rag": dataset_loader.load_rag_dataset,
+        "agent": dataset_loader.load_agent_dataset,
+        "chatbot": dataset_loader.load_chatbot_dataset,
+    }
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = {name: executor.submit(load) for name, load in loaders.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _evaluate_cached(evaluator, test_cases):
+    """
+    Run evaluator.evaluate(test_cases), reusing results saved by an earlier run.
+
+    Results are cached only when EVAL_CACHE is enabled, keyed by the evaluator
+    class, judge model, thresholds and test case contents.
+    """
+    if not settings.eval_cache:
+        return evaluator.evaluate(test_cases)
+
+    key_data = {
+        "evaluator": type(evaluator).__name__,
+        "model": evaluator.model.get_model_name(),
+        "threshold": evaluator.threshold,
+        "toxicity_threshold": getattr(evaluator, "toxicity_threshold", None),
+        "fail_fast": getattr(evaluator, "fail_fast", None),
+        "combined": getattr(evaluator, "combined_metric", None) is not None,
+        "batch_size": getattr(evaluator, "batch_size", None),
+        "test_cases": [test_case.model_dump() for test_case in test_cases],
+    }
+    key = hashlib.sha256(
+        json.dumps(key_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    cache_path = settings.report_dir / ".eval_cache" / f"{key}.json"
+
+    if cache_path.exists():
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+
+    results = evaluator.evaluate(test_cases)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(results, ensure_ascii=False), encoding="utf-8")
+    return results
+
+
+@pytest.fixture(scope="session")
+def evaluate_cached():
+    """Evaluate test cases through the optional on-disk results cache."""
+    return _evaluate_cached
+
+
+def _save_results(results, system_type, report=None):
+    """
+    Save evaluation results to <system_type>_evaluation_results.json in the report directory.
+
+    The JSON is compact and meant for machines; pass the generate_report() text as
+    report to also write it to a sibling .txt for people.
+    """
+    # ReportGenerator serializes with orjson when it is installed
+    output_path = ReportGenerator(settings.report_dir).save_json_report(
+        results, system_type, f"{system_type}_evaluation_results.json"
+    )
+    print(f"\n📊 Results saved to: {output_path}")
+
+    if report is not None:
+        report_path = output_path.with_suffix(".txt")
+        report_path.write_text(report + "\n", encoding="utf-8")
+        print(f"📝 Report saved to: {report_path}")
+
+
+@pytest.fixture(scope="session")
+def save_results():
+    """Save evaluation results (and optionally the text report) to the report directory."""
+    return _save_results
@@ -2,45 +2,38 @@
 Test suite for Agent system evaluation using DeepEval.
 """
 import pytest
-from pathlib import Path
+import sys
 from src.config.settings import settings
-from src.data.loader import DatasetLoader
-from src.evaluators.base import GeminiModel
+from src.evaluators.base import MetricResult
 from src.evaluators.agent_evaluator import AgentEvaluator
+from src.utils.report import input_preview
+from tests._report_format import metric_line
 
 
-@pytest.fixture(scope="module")
-def gemini_model():
-    """Create Gemini model instance."""
-    settings.validate_api_key()
-    return GeminiModel(
-        model=settings.gemini_model,
-        api_key=settings.gemini_api_key,
-    )
-
-
-@pytest.fixture(scope="module")
-def dataset_loader():
-    """Create dataset loader instance."""
-    return DatasetLoader(settings.datasets_dir)
-
-
-@pytest.fixture(scope="module")
-def agent_test_cases(dataset_loader):
+@pytest.fixture(scope="session")
+def agent_test_cases(datasets):
     """Load Agent test cases."""
-    return dataset_loader.load_agent_dataset()
+    return datasets["agent"]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def agent_evaluator(gemini_model):
     """Create Agent evaluator instance."""
     return AgentEvaluator(
         model=gemini_model,
         threshold=settings.default_threshold,
+        max_concurrent=settings.max_concurrent,
+        batch_size=settings.judge_batch_size or None,
     )
 
 
-def test_agent_evaluation(agent_evaluator, agent_test_cases):
+@pytest.fixture(scope="session")
+def agent_results(evaluate_cached, agent_evaluator, agent_test_cases):
+    """Evaluate Agent test cases once and share the results across tests."""
+    return evaluate_cached(agent_evaluator, agent_test_cases)
+
+
+def test_agent_evaluation(agent_evaluator, agent_test_cases, agent_results, save_results):
     """
     Test Agent system evaluation.
     Evaluates Correctness and Answer Relevancy.
@@ -48,15 +41,14 @@ def test_agent_evaluation(agent_evaluator, agent_test_cases):
     # Validate dataset
     assert len(agent_test_cases) > 0, "No test cases found"
 
-    # Run evaluation
-    results = agent_evaluator.evaluate(agent_test_cases)
+    results = agent_results
 
     # Generate and print report
     report = agent_evaluator.generate_report(results)
     print("\n" + report)
 
     # Save results
-    _save_results(results, "agent_evaluation_results.json")
+    save_results(results, "agent", report)
 
     # Assertions
     assert results["total_cases"] == len(agent_test_cases)
@@ -74,51 +66,45 @@ def test_agent_evaluation(agent_evaluator, agent_test_cases):
         f"Answer Relevancy score too low: {results['average_answer_relevancy']:.3f}"
 
 
-def test_agent_individual_cases(agent_evaluator, agent_test_cases):
+@pytest.mark.report
+def test_agent_individual_cases(agent_results):
     """
     Test individual Agent test cases.
     Prints detailed results for each test case.
     """
-    results = agent_evaluator.evaluate(agent_test_cases)
+    results = agent_results
 
-    print("\n" + "=" * 60)
-    print("INDIVIDUAL TEST CASE RESULTS")
-    print("=" * 60)
+    # Collect the report lines and write them once instead of printing each line
+    lines = [
+        "\n" + "=" * 60,
+        "INDIVIDUAL TEST CASE RESULTS",
+        "=" * 60,
+    ]
 
     failed_cases = []
 
+    # Read each metric through a slotted MetricResult instead of repeated dict lookups
     for result in results["individual_results"]:
         test_id = result["test_case_id"]
-        print(f"\nTest Case {test_id}:")
-        print(f"  Input: {result['input'][:80]}...")
+        lines.append(f"\nTest Case {test_id}:")
+        lines.append(f"  Input: {input_preview(result['input'])}")
 
         # Correctness
-        correctness = result["correctness"]
-        print(f"  Correctness: {correctness['score']:.3f} - {'✅ PASS' if correctness['passed'] else '❌ FAIL'}")
+        correctness = MetricResult(**result["correctness"])
+        lines.append(metric_line("Correctness", correctness))
 
         # Answer Relevancy
-        relevancy = result["answer_relevancy"]
-        print(f"  Answer Relevancy: {relevancy['score']:.3f} - {'✅ PASS' if relevancy['passed'] else '❌ FAIL'}")
+        relevancy = MetricResult(**result["answer_relevancy"])
+        lines.append(metric_line("Answer Relevancy", relevancy))
 
         # Track failed cases
-        if not (correctness['passed'] and relevancy['passed']):
+        if not (correctness.passed and relevancy.passed):
             failed_cases.append(test_id)
 
     if failed_cases:
-        print(f"\n⚠️  Failed test cases: {failed_cases}")
-
-
-def _save_results(results: dict, filename: str):
-    """Save evaluation results to JSON file."""
-    import json
-
-    settings.ensure_directories()
-    output_path = settings.report_dir / filename
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        lines.append(f"\n⚠️  Failed test cases: {failed_cases}")
 
-    print(f"\n📊 Results saved to: {output_path}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
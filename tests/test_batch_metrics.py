@@ -0,0 +1,136 @@
+"""
+Offline tests for the batched judge metrics, using stand-in judge models.
+"""
+import asyncio
+
+import pytest
+from deepeval.test_case import LLMTestCase
+from src.evaluators.batch_metrics import (
+    BatchGEval,
+    BatchScore,
+    BatchScores,
+    CombinedGEval,
+    CriterionScore,
+    CriterionScores,
+)
+
+
+class JsonJudge:
+    """Judge model that answers in JSON mode with a fixed parsed response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    async def a_generate_json(self, prompt, schema):
+        self.prompts.append(prompt)
+        assert isinstance(self.response, schema)
+        return self.response
+
+
+class TextJudge:
+    """Judge model without JSON mode that answers with free text."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    async def a_generate(self, prompt):
+        self.prompts.append(prompt)
+        return self.response
+
+
+def _cases(count):
+    return [
+        LLMTestCase(input=f"q{i}", actual_output=f"a{i}", expected_output=f"e{i}")
+        for i in range(count)
+    ]
+
+
+def test_batch_scores_are_ordered_and_normalized():
+    """Scores come back in case order, clamped to 0-10 and scaled to 0-1."""
+    judge = JsonJudge(BatchScores(results=[
+        BatchScore(index=2, score=12, reason="r2"),
+        BatchScore(index=0, score=7, reason="r0"),
+        BatchScore(index=1, score=-3, reason="r1"),
+    ]))
+    metric = BatchGEval(name="Correctness", criteria="be correct", model=judge)
+
+    scores = asyncio.run(metric.a_measure_batch(_cases(3)))
+
+    assert scores == [(0.7, "r0"), (0.0, "r1"), (1.0, "r2")]
+    assert len(judge.prompts) == 1
+    assert "be correct" in judge.prompts[0]
+    assert '"input": "q2"' in judge.prompts[0]
+
+
+def test_batch_text_response_is_parsed():
+    """Models without JSON mode are parsed from the JSON object inside their text."""
+    judge = TextJudge(
+        'Here you go:\n{"results": [{"index": 0, "score": 5, "reason": "ok"}]}\nDone.'
+    )
+    metric = BatchGEval(name="Correctness", criteria="be correct", model=judge)
+
+    assert asyncio.run(metric.a_measure_batch(_cases(1))) == [(0.5, "ok")]
+
+
+def test_batch_missing_case_raises():
+    """A response that skips a case is rejected instead of shifting scores."""
+    judge = JsonJudge(BatchScores(results=[BatchScore(index=0, score=5, reason="ok")]))
+    metric = BatchGEval(name="Correctness", criteria="be correct", model=judge)
+
+    with pytest.raises(ValueError, match=r"missing cases: \[1\]"):
+        asyncio.run(metric.a_measure_batch(_cases(2)))
+
+
+def _combined_metric(judge):
+    return CombinedGEval(
+        name="Combined RAG",
+        criteria={"faithfulness": "f", "contextual_recall": "c", "answer_relevancy": "a"},
+        model=judge,
+    )
+
+
+def _rag_case():
+    return LLMTestCase(
+        input="q", actual_output="a", expected_output="e", retrieval_context=["doc"]
+    )
+
+
+def test_combined_scores_follow_criteria_order():
+    """One request scores every criterion; results follow the criteria order."""
+    judge = JsonJudge(CriterionScores(results=[
+        CriterionScore(name="answer_relevancy", score=9, reason="ra"),
+        CriterionScore(name="faithfulness", score=8, reason="rf"),
+        CriterionScore(name="contextual_recall", score=11, reason="rc"),
+    ]))
+
+    scores = asyncio.run(_combined_metric(judge).a_measure(_rag_case()))
+
+    assert scores == [(0.8, "rf"), (1.0, "rc"), (0.9, "ra")]
+    assert len(judge.prompts) == 1
+    assert '"retrieval_context": [' in judge.prompts[0]
+
+
+def test_combined_text_response_is_parsed():
+    """Models without JSON mode are parsed from the JSON object inside their text."""
+    judge = TextJudge(
+        'noise {"results": ['
+        '{"name": "faithfulness", "score": 1, "reason": "f"}, '
+        '{"name": "contextual_recall", "score": 2, "reason": "c"}, '
+        '{"name": "answer_relevancy", "score": 3, "reason": "a"}]} noise'
+    )
+
+    scores = asyncio.run(_combined_metric(judge).a_measure(_rag_case()))
+
+    assert scores == [(0.1, "f"), (0.2, "c"), (0.3, "a")]
+
+
+def test_combined_missing_criterion_raises():
+    """A response that skips a criterion is rejected."""
+    judge = JsonJudge(CriterionScores(results=[
+        CriterionScore(name="faithfulness", score=8, reason="rf"),
+    ]))
+
+    with pytest.raises(ValueError, match="contextual_recall"):
+        asyncio.run(_combined_metric(judge).a_measure(_rag_case()))
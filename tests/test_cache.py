@@ -0,0 +1,132 @@
+"""
+Offline tests for the persistent judge-response cache and the in-memory response cache.
+"""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from src.utils import cache as cache_module
+from src.utils.cache import JudgeCache, ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cache module's clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(
+        cache_module,
+        "time",
+        SimpleNamespace(time=lambda: now[0], monotonic=lambda: now[0]),
+    )
+    return now
+
+
+def test_make_key_is_stable_and_content_sensitive():
+    """The same parts give the same key; any changed part gives a different key."""
+    parts = ["gemini", "GEval", "Correctness", "q", "a", "e", None]
+
+    assert JudgeCache.make_key(parts) == JudgeCache.make_key(list(parts))
+    assert JudgeCache.make_key(parts) != JudgeCache.make_key(parts[:-1] + [["ctx"]])
+
+
+def test_round_trip_and_persistence(tmp_path):
+    """Stored scores come back, also from a new instance over the same directory."""
+    cache = JudgeCache(tmp_path)
+    cache.set("k", 0.8, "good")
+    assert cache.get("k") == (0.8, "good")
+    assert cache.get("missing") is None
+    cache.close()
+
+    reopened = JudgeCache(tmp_path)
+    assert reopened.get("k") == (0.8, "good")
+    reopened.close()
+
+
+def test_set_overwrites_existing_key(tmp_path):
+    """Setting a key twice keeps only the latest result."""
+    cache = JudgeCache(tmp_path)
+    cache.set("k", 0.2, "old")
+    cache.set("k", 0.9, "new")
+
+    assert cache.get("k") == (0.9, "new")
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    """Entries older than ttl are treated as missing and removed."""
+    cache = JudgeCache(tmp_path, ttl=60)
+    cache.set("k", 0.5, "reason")
+
+    clock[0] += 60
+    assert cache.get("k") == (0.5, "reason")
+
+    clock[0] += 1
+    assert cache.get("k") is None
+    count = cache._conn.execute("SELECT COUNT(*) FROM judge_cache").fetchone()[0]
+    assert count == 0
+    cache.close()
+
+
+def test_max_size_evicts_least_recently_used(tmp_path, clock):
+    """When full, the entry that was used least recently is evicted first."""
+    cache = JudgeCache(tmp_path, max_size=2)
+    cache.set("a", 0.1, "a")
+    clock[0] += 1
+    cache.set("b", 0.2, "b")
+    clock[0] += 1
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == (0.1, "a")
+    clock[0] += 1
+    cache.set("c", 0.3, "c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == (0.1, "a")
+    assert cache.get("c") == (0.3, "c")
+    cache.close()
+
+
+def test_opens_cache_files_without_time_columns(tmp_path):
+    """Cache files created before TTL/LRU support are migrated and stay readable."""
+    conn = sqlite3.connect(tmp_path / "judge_cache.sqlite3")
+    conn.execute("CREATE TABLE judge_cache (key TEXT PRIMARY KEY, score REAL, reason TEXT)")
+    conn.execute("INSERT INTO judge_cache VALUES ('k', 0.7, 'legacy')")
+    conn.commit()
+    conn.close()
+
+    cache = JudgeCache(tmp_path, max_size=10)
+    assert cache.get("k") == (0.7, "legacy")
+    cache.close()
+
+
+def test_response_cache_counts_hits_and_misses():
+    """get() records hits and misses; keys depend on model, prompt and schema."""
+    cache = ResponseCache()
+    key = ResponseCache.make_key("gemini", "prompt")
+    assert key != ResponseCache.make_key("gemini", "prompt", "Schema")
+
+    assert cache.get(key) is None
+    cache.set(key, "text")
+    assert cache.get(key) == "text"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_response_cache_expires_entries(clock):
+    """Entries older than ttl are dropped on access."""
+    cache = ResponseCache(ttl=10)
+    cache.set("k", "text")
+
+    clock[0] += 11
+    assert cache.get("k") is None
+
+
+def test_response_cache_evicts_least_recently_used():
+    """Beyond max_size, the least recently used entry is evicted."""
+    cache = ResponseCache(max_size=2, ttl=None)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
@@ -3,46 +3,37 @@ Test suite for Chatbot system evaluation using DeepEval.
 """
 import pytest
 import sys
-from pathlib import Path
 from src.config.settings import settings
-from src.data.loader import DatasetLoader
-from src.evaluators.base import GeminiModel
+from src.evaluators.base import MetricResult
 from src.evaluators.chatbot_evaluator import ChatbotEvaluator
+from src.utils.report import input_preview
+from tests._report_format import metric_line
 
 
-@pytest.fixture(scope="module")
-def gemini_model():
-    """Create Gemini model instance."""
-    settings.validate_api_key()
-    return GeminiModel(
-        model=settings.gemini_model,
-        api_key=settings.gemini_api_key,
-    )
-
-
-@pytest.fixture(scope="module")
-def dataset_loader():
-    """Create dataset loader instance."""
-    return DatasetLoader(settings.datasets_dir)
-
-
-@pytest.fixture(scope="module")
-def chatbot_test_cases(dataset_loader):
+@pytest.fixture(scope="session")
+def chatbot_test_cases(datasets):
     """Load Chatbot test cases."""
-    return dataset_loader.load_chatbot_dataset()
+    return datasets["chatbot"]
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def chatbot_evaluator(gemini_model):
     """Create Chatbot evaluator instance."""
     return ChatbotEvaluator(
         model=gemini_model,
         threshold=settings.default_threshold,
         toxicity_threshold=settings.toxicity_threshold,
+        max_concurrent=settings.max_concurrent,
     )
 
 
-def test_chatbot_evaluation(chatbot_evaluator, chatbot_test_cases):
+@pytest.fixture(scope="session")
+def chatbot_results(evaluate_cached, chatbot_evaluator, chatbot_test_cases):
+    """Evaluate Chatbot test cases once and share the results across tests."""
+    return evaluate_cached(chatbot_evaluator, chatbot_test_cases)
+
+
+def test_chatbot_evaluation(chatbot_evaluator, chatbot_test_cases, chatbot_results, save_results):
     """
     Test Chatbot system evaluation.
     Evaluates Toxicity and Answer Relevancy.
@@ -50,15 +41,14 @@ def test_chatbot_evaluation(chatbot_evaluator, chatbot_test_cases):
     # Validate dataset
     assert len(chatbot_test_cases) > 0, "No test cases found"
 
-    # Run evaluation
-    results = chatbot_evaluator.evaluate(chatbot_test_cases)
+    results = chatbot_results
 
     # Generate and print report
     report = chatbot_evaluator.generate_report(results)
     print("\n" + report)
 
     # Save results
-    _save_results(results, "chatbot_evaluation_results.json")
+    save_results(results, "chatbot", report)
 
     # Assertions
     assert results["total_cases"] == len(chatbot_test_cases)
@@ -86,12 +76,12 @@ def test_chatbot_evaluation(chatbot_evaluator, chatbot_test_cases):
         f"Answer Relevancy score too low: {results['average_answer_relevancy']:.3f}"
 
 
-def test_chatbot_toxicity_check(chatbot_evaluator, chatbot_test_cases):
+def test_chatbot_toxicity_check(chatbot_results):
     """
     Dedicated test for toxicity checking.
     This test must pass with zero toxic responses.
     """
-    results = chatbot_evaluator.evaluate(chatbot_test_cases)
+    results = chatbot_results
 
     print("\n" + "=" * 60)
     print("TOXICITY CHECK RESULTS")
@@ -107,53 +97,47 @@ def test_chatbot_toxicity_check(chatbot_evaluator, chatbot_test_cases):
     print("\n✅ All responses are non-toxic")
 
 
-def test_chatbot_individual_cases(chatbot_evaluator, chatbot_test_cases):
+@pytest.mark.report
+def test_chatbot_individual_cases(chatbot_results):
     """
     Test individual Chatbot test cases.
     Prints detailed results for each test case.
     """
-    results = chatbot_evaluator.evaluate(chatbot_test_cases)
+    results = chatbot_results
 
-    print("\n" + "=" * 60)
-    print("INDIVIDUAL TEST CASE RESULTS")
-    print("=" * 60)
+    # Collect the report lines and write them once instead of printing each line
+    lines = [
+        "\n" + "=" * 60,
+        "INDIVIDUAL TEST CASE RESULTS",
+        "=" * 60,
+    ]
 
     failed_cases = []
 
+    # Read each metric through a slotted MetricResult instead of repeated dict lookups
     for result in results["individual_results"]:
         test_id = result["test_case_id"]
-        print(f"\nTest Case {test_id}:")
-        print(f"  Input: {result['input'][:80]}...")
+        lines.append(f"\nTest Case {test_id}:")
+        lines.append(f"  Input: {input_preview(result['input'])}")
 
         # Toxicity
-        toxicity = result["toxicity"]
-        print(f"  Toxicity: {toxicity['score']:.3f} - {'✅ PASS' if toxicity['passed'] else '❌ FAIL'}")
-        if not toxicity['passed']:
-            print(f"    ⚠️  Reason: {toxicity['reason']}")
+        toxicity = MetricResult(**result["toxicity"])
+        lines.append(metric_line("Toxicity", toxicity))
+        if not toxicity.passed:
+            lines.append(f"    ⚠️  Reason: {toxicity.reason}")
 
         # Answer Relevancy
-        relevancy = result["answer_relevancy"]
-        print(f"  Answer Relevancy: {relevancy['score']:.3f} - {'✅ PASS' if relevancy['passed'] else '❌ FAIL'}")
+        relevancy = MetricResult(**result["answer_relevancy"])
+        lines.append(metric_line("Answer Relevancy", relevancy))
 
         # Track failed cases
-        if not (toxicity['passed'] and relevancy['passed']):
+        if not (toxicity.passed and relevancy.passed):
             failed_cases.append(test_id)
 
     if failed_cases:
-        print(f"\n⚠️  Failed test cases: {failed_cases}")
-
-
-def _save_results(results: dict, filename: str):
-    """Save evaluation results to JSON file."""
-    import json
-
-    settings.ensure_directories()
-    output_path = settings.report_dir / filename
-
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        lines.append(f"\n⚠️  Failed test cases: {failed_cases}")
 
-    print(f"\n📊 Results saved to: {output_path}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
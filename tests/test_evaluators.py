@@ -0,0 +1,165 @@
+"""
+Offline tests for the evaluators' scheduling logic, using stand-in metrics instead of Gemini.
+"""
+from src.data.loader import AgentTestCase, ChatbotTestCase, RAGTestCase
+from src.evaluators.agent_evaluator import AgentEvaluator
+from src.evaluators.chatbot_evaluator import ChatbotEvaluator
+from src.evaluators.rag_evaluator import RAG_CRITERIA, RAGEvaluator
+from src.utils.cache import JudgeCache
+from src.utils.results_stream import load_results
+from tests._fakes import FakeJudge, FakeMetric
+
+
+class FakeCombinedMetric:
+    """Stand-in for CombinedGEval that returns fixed scores in RAG_CRITERIA order."""
+
+    def __init__(self, scores):
+        self.name = "Combined RAG"
+        self.criteria = RAG_CRITERIA
+        self.scores = scores
+        self.calls = []
+
+    async def a_measure(self, test_case):
+        self.calls.append(test_case.input)
+        return self.scores
+
+
+def _chatbot_evaluator(toxicity_scores, **kwargs):
+    """ChatbotEvaluator with fake metrics: toxicity from the table (default 0.0), relevancy 0.9."""
+    evaluator = ChatbotEvaluator(FakeJudge(), **kwargs)
+    evaluator.toxicity_metric = FakeMetric("Toxicity", toxicity_scores, default=0.0)
+    evaluator.answer_relevancy_metric = FakeMetric("Answer Relevancy")
+    return evaluator
+
+
+def _chatbot_cases(*inputs):
+    return [ChatbotTestCase(input=text, actual_output="a") for text in inputs]
+
+
+def test_agent_duplicates_share_one_judgement_and_empty_cases_skip_the_judge():
+    """Each distinct case is judged once; results fan out to every original index."""
+    evaluator = AgentEvaluator(FakeJudge())
+    evaluator.correctness_metric = FakeMetric("Correctness", {"q0": 0.8, "q1": 0.6})
+    evaluator.answer_relevancy_metric = FakeMetric("Answer Relevancy")
+    test_cases = [
+        AgentTestCase(input=text, actual_output=output, expected_output="e")
+        for text, output in [("q0", "a"), ("q1", "a"), ("q0", "a"), ("q3", ""), ("q1", "a")]
+    ]
+
+    results = evaluator.evaluate(test_cases)
+
+    assert sorted(evaluator.correctness_metric.calls) == ["q0", "q1"]
+    assert sorted(evaluator.answer_relevancy_metric.calls) == ["q0", "q1"]
+    assert results["correctness_scores"] == [0.8, 0.6, 0.8, 0.0, 0.6]
+    assert [r["test_case_id"] for r in results["individual_results"]] == [0, 1, 2, 3, 4]
+    assert results["individual_results"][3]["skipped"]
+    assert results["skipped_cases"] == 1
+
+
+def test_rag_deduplicates_on_context_and_skips_empty_context():
+    """Cases differing only in context are judged separately; an empty context is not judged."""
+    evaluator = RAGEvaluator(FakeJudge())
+    evaluator.faithfulness_metric = FakeMetric("Faithfulness", {"q0": 0.8})
+    evaluator.contextual_recall_metric = FakeMetric("Contextual Recall")
+    evaluator.answer_relevancy_metric = FakeMetric("Answer Relevancy")
+    test_cases = [
+        RAGTestCase(input="q0", actual_output="a", expected_output="e", context=context)
+        for context in (["d1"], ["d2"], ["d1"], [])
+    ]
+
+    results = evaluator.evaluate(test_cases)
+
+    for metric in (
+        evaluator.faithfulness_metric,
+        evaluator.contextual_recall_metric,
+        evaluator.answer_relevancy_metric,
+    ):
+        assert len(metric.calls) == 2
+    assert results["faithfulness_scores"] == [0.8, 0.8, 0.8, 0.0]
+    assert [r["context"] for r in results["individual_results"]] == [["d1"], ["d2"], ["d1"], []]
+    assert results["skipped_cases"] == 1
+
+
+def test_chatbot_duplicates_share_one_judgement_and_empty_cases_skip_the_judge():
+    """Repeated chatbot turns are judged once and empty inputs are not judged."""
+    evaluator = _chatbot_evaluator({"q1": 0.5})
+
+    results = evaluator.evaluate(_chatbot_cases("q0", "q1", "", "q1", "q0"))
+
+    assert sorted(evaluator.toxicity_metric.calls) == ["q0", "q1"]
+    assert sorted(evaluator.answer_relevancy_metric.calls) == ["q0", "q1"]
+    assert results["toxicity_scores"] == [0.0, 0.5, 0.0, 0.5, 0.0]
+    assert [case["test_case_id"] for case in results["toxic_cases"]] == [1, 3]
+    assert [r["test_case_id"] for r in results["individual_results"]] == [0, 1, 2, 3, 4]
+    assert results["skipped_cases"] == 1
+
+
+def test_fail_fast_keeps_relevancy_measured_before_the_toxic_case():
+    """Cases before the first toxic one keep their relevancy; later cases are never measured."""
+    evaluator = _chatbot_evaluator({"q3": 0.9}, max_concurrent=1, fail_fast=True)
+
+    results = evaluator.evaluate(_chatbot_cases("q0", "q1", "q2", "q3", "q4", "q5"))
+
+    assert [r["test_case_id"] for r in results["individual_results"]] == [0, 1, 2, 3]
+    assert results["toxicity_scores"] == [0.0, 0.0, 0.0, 0.9]
+    assert results["answer_relevancy_scores"] == [0.9, 0.9, 0.9, None]
+    assert results["average_answer_relevancy"] == 0.9
+    assert [case["test_case_id"] for case in results["toxic_cases"]] == [3]
+    assert results["early_terminated"] and not results["passed"]
+    assert evaluator.toxicity_metric.calls == ["q0", "q1", "q2", "q3"]
+    assert evaluator.answer_relevancy_metric.calls == ["q0", "q1", "q2"]
+
+
+def test_fail_fast_cuts_off_by_dataset_index(tmp_path):
+    """Duplicates and empty cases after the toxic case are dropped from the results and the file."""
+    path = tmp_path / "chatbot_results.jsonl"
+    evaluator = _chatbot_evaluator({"toxic": 0.9}, fail_fast=True)
+    # Case 2 repeats case 0 and case 3 is empty; both come after the toxic case 1
+    test_cases = _chatbot_cases("q0", "toxic", "q0", "", "q4")
+
+    results = evaluator.evaluate(test_cases, path)
+
+    assert [r["test_case_id"] for r in load_results(path)] == [0, 1]
+    assert results["toxicity_scores"] == [0.0, 0.9]
+    assert results["answer_relevancy_scores"] == [0.9, None]
+    assert results["skipped_cases"] == 0
+
+
+def test_fail_fast_without_toxic_cases_measures_everything():
+    """With no toxic case, fail_fast reports the same as a full run."""
+    test_cases = _chatbot_cases("q0", "q1", "q2")
+    fail_fast = _chatbot_evaluator({}, fail_fast=True).evaluate(test_cases)
+    full = _chatbot_evaluator({}).evaluate(test_cases)
+
+    assert fail_fast == full
+    assert not fail_fast["early_terminated"] and fail_fast["passed"]
+
+
+def _combined_rag_evaluator(cache, scores):
+    """RAGEvaluator in combined mode whose combined judgement always returns `scores`."""
+    evaluator = RAGEvaluator(FakeJudge(), cache=cache, combined=True)
+    evaluator.combined_metric = FakeCombinedMetric(scores)
+    return evaluator
+
+
+def test_combined_scores_are_split_per_metric_and_cached(tmp_path):
+    """One combined judgement fills all three metrics and is answered from the judge cache next time."""
+    cache = JudgeCache(tmp_path)
+    scores = [(0.8, "faithful"), (0.6, "recall"), (0.9, "relevant")]
+    test_cases = [RAGTestCase(input="q", actual_output="a", expected_output="e", context=["doc"])]
+
+    first = _combined_rag_evaluator(cache, scores)
+    results = first.evaluate(test_cases)
+
+    assert results["faithfulness_scores"] == [0.8]
+    assert results["contextual_recall_scores"] == [0.6]
+    assert results["answer_relevancy_scores"] == [0.9]
+    assert results["individual_results"][0]["contextual_recall"] == {
+        "score": 0.6, "passed": False, "reason": "recall",
+    }
+    assert first.combined_metric.calls == ["q"]
+
+    second = _combined_rag_evaluator(cache, scores)
+    assert second.evaluate(test_cases) == results
+    assert second.combined_metric.calls == []
+    cache.close()
@@ -0,0 +1,101 @@
+"""
+Offline tests for the RPM/TPM token bucket that throttles Gemini calls.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from src.utils import rate_limiter as rate_limiter_module
+from src.utils.rate_limiter import AsyncTokenBucket, estimate_tokens
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the limiter's clock and sleeps with a clock that only moves when slept on."""
+    now = [0.0]
+    slept = []
+
+    def sleep(delay):
+        slept.append(delay)
+        now[0] += delay
+
+    async def async_sleep(delay):
+        sleep(delay)
+
+    monkeypatch.setattr(
+        rate_limiter_module,
+        "time",
+        SimpleNamespace(monotonic=lambda: now[0], sleep=sleep),
+    )
+    monkeypatch.setattr(rate_limiter_module.asyncio, "sleep", async_sleep)
+    return SimpleNamespace(now=now, slept=slept)
+
+
+def test_estimate_tokens():
+    """Roughly one token per four characters."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a" * 400) == 100
+
+
+def test_unlimited_bucket_never_waits(clock):
+    """Without rpm/tpm every request goes through immediately."""
+    bucket = AsyncTokenBucket()
+    for _ in range(1000):
+        assert bucket._reserve(10_000) == 0
+    assert clock.slept == []
+
+
+def test_rpm_limits_requests_and_refills_over_time(clock):
+    """A full bucket allows rpm requests, then refills at rpm per minute."""
+    bucket = AsyncTokenBucket(rpm=2)
+
+    assert bucket._reserve(0) == 0
+    assert bucket._reserve(0) == 0
+    assert bucket._reserve(0) == pytest.approx(30)
+
+    clock.now[0] += 30
+    assert bucket._reserve(0) == 0
+
+
+def test_tpm_limits_tokens(clock):
+    """Requests wait until enough tokens have refilled."""
+    bucket = AsyncTokenBucket(tpm=600)
+
+    assert bucket._reserve(500) == 0
+    # 100 tokens left; 200 more need 200 * 60 / 600 = 20 seconds
+    assert bucket._reserve(300) == pytest.approx(20)
+
+    clock.now[0] += 20
+    assert bucket._reserve(300) == 0
+
+
+def test_oversized_request_is_capped_at_tpm(clock):
+    """A request larger than the whole per-minute quota waits for a full bucket, not forever."""
+    bucket = AsyncTokenBucket(tpm=100)
+    bucket._reserve(100)
+
+    assert bucket._reserve(10_000) == pytest.approx(60)
+
+
+def test_acquire_sync_sleeps_until_capacity(clock):
+    """acquire_sync blocks for the computed delay, then takes the request."""
+    bucket = AsyncTokenBucket(rpm=60)
+    for _ in range(60):
+        bucket.acquire_sync()
+
+    bucket.acquire_sync()
+
+    assert clock.slept == [pytest.approx(1)]
+
+
+def test_acquire_waits_without_blocking_the_loop(clock):
+    """acquire awaits asyncio.sleep for the computed delay, then takes the request."""
+    bucket = AsyncTokenBucket(rpm=1, tpm=1000)
+
+    async def run():
+        await bucket.acquire(100)
+        await bucket.acquire(100)
+
+    asyncio.run(run())
+
+    assert clock.slept == [pytest.approx(60)]
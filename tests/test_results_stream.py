@@ -0,0 +1,130 @@
+"""
+Offline tests for streaming individual results to JSONL and resuming from them.
+"""
+import pytest
+from src.data.loader import AgentTestCase, ChatbotTestCase
+from src.evaluators.agent_evaluator import AgentEvaluator
+from src.utils.results_stream import ResultsStream, case_key, load_results
+from tests._fakes import FakeJudge, FakeMetric
+
+
+def _write_run(path, test_cases):
+    """Simulate an evaluator run: resume, then write a record for every pending case."""
+    stream = ResultsStream(path)
+    completed = stream.completed_results(test_cases)
+    pending = [i for i in range(len(test_cases)) if i not in completed]
+    for i in pending:
+        stream.write({
+            "test_case_id": i,
+            "input": test_cases[i].input,
+            "actual_output": test_cases[i].actual_output,
+            "score": 1.0,
+        })
+    stream.close()
+    return pending
+
+
+def _line_count(path):
+    return len(path.read_bytes().splitlines())
+
+
+def test_case_key_covers_every_field():
+    """Changing any field, not just input/output, changes the resume key."""
+    base = AgentTestCase(input="q", actual_output="a", expected_output="e1")
+    changed = AgentTestCase(input="q", actual_output="a", expected_output="e2")
+
+    assert case_key(base) == case_key(AgentTestCase(**base.model_dump()))
+    assert case_key(base) != case_key(changed)
+
+
+def test_resume_skips_unchanged_cases(tmp_path):
+    """A second run over the same cases evaluates nothing and leaves the file as is."""
+    path = tmp_path / "chatbot_results.jsonl"
+    test_cases = [ChatbotTestCase(input=f"q{i}", actual_output="a") for i in range(9)]
+
+    assert _write_run(path, test_cases) == list(range(9))
+    assert _write_run(path, test_cases) == []
+    assert _line_count(path) == 9
+
+
+def test_resume_reevaluates_cases_with_changed_expected_output(tmp_path):
+    """Cases whose expected_output changed are re-evaluated instead of reusing stale scores."""
+    path = tmp_path / "agent_results.jsonl"
+    test_cases = [
+        AgentTestCase(input=f"q{i}", actual_output="a", expected_output="old")
+        for i in range(3)
+    ]
+    _write_run(path, test_cases)
+
+    test_cases[1] = AgentTestCase(input="q1", actual_output="a", expected_output="new")
+
+    assert _write_run(path, test_cases) == [1]
+    # The stale record is replaced, not kept alongside the new one
+    assert _line_count(path) == 3
+    assert [r["test_case_id"] for r in load_results(path)] == [0, 1, 2]
+
+
+def test_records_without_case_key_are_reevaluated(tmp_path):
+    """Files written before case keys existed are re-evaluated and compacted."""
+    path = tmp_path / "chatbot_results.jsonl"
+    path.write_text(
+        '{"test_case_id": 0, "input": "q0", "actual_output": "a"}\n', encoding="utf-8"
+    )
+    test_cases = [ChatbotTestCase(input="q0", actual_output="a")]
+
+    assert _write_run(path, test_cases) == [0]
+    assert _line_count(path) == 1
+    assert load_results(path)[0]["case_key"] == case_key(test_cases[0])
+
+
+def test_records_beyond_the_dataset_are_dropped(tmp_path):
+    """Records for cases no longer in the dataset are removed when the file is compacted."""
+    path = tmp_path / "chatbot_results.jsonl"
+    _write_run(path, [ChatbotTestCase(input=f"q{i}", actual_output="a") for i in range(3)])
+
+    test_cases = [ChatbotTestCase(input="q0", actual_output="changed")]
+    _write_run(path, test_cases)
+
+    assert [r["test_case_id"] for r in load_results(path)] == [0]
+
+
+def test_incomplete_last_line_is_discarded(tmp_path):
+    """A partial line left by an interrupted run is ignored and truncated on the next write."""
+    path = tmp_path / "chatbot_results.jsonl"
+    test_cases = [ChatbotTestCase(input=f"q{i}", actual_output="a") for i in range(2)]
+    _write_run(path, test_cases[:1])
+    with open(path, "ab") as f:
+        f.write(b'{"test_case_id": 1, "inp')
+
+    assert _write_run(path, test_cases) == [1]
+    assert _line_count(path) == 2
+
+
+def _agent_evaluator(fail_on=()):
+    """AgentEvaluator whose metrics score 0.9 offline, raising for inputs in fail_on."""
+    evaluator = AgentEvaluator(FakeJudge())
+    evaluator.correctness_metric = FakeMetric("Correctness", fail_on=fail_on)
+    evaluator.answer_relevancy_metric = FakeMetric("Answer Relevancy")
+    return evaluator
+
+
+def test_interrupted_run_resumes_after_completed_cases(tmp_path):
+    """Cases finished before a judge failure are already on disk and are not measured again."""
+    path = tmp_path / "agent_results.jsonl"
+    test_cases = [
+        AgentTestCase(input=f"q{i}", actual_output="a", expected_output="e") for i in range(6)
+    ]
+
+    with pytest.raises(RuntimeError, match="judge unavailable"):
+        _agent_evaluator(fail_on={"q3"}).evaluate(test_cases, path)
+    finished = {r["test_case_id"] for r in load_results(path)}
+    assert finished and 3 not in finished
+
+    evaluator = _agent_evaluator()
+    results = evaluator.evaluate(test_cases, path)
+
+    remaining = [f"q{i}" for i in range(6) if i not in finished]
+    assert sorted(evaluator.correctness_metric.calls) == remaining
+    assert sorted(evaluator.answer_relevancy_metric.calls) == remaining
+    assert [r["test_case_id"] for r in load_results(path)] == list(range(6))
+    assert results["correctness_scores"] == [0.9] * 6